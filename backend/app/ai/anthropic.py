@@ -1,18 +1,51 @@
-from app.ai.base import AIProvider, GeneratedQuestion
+from app.ai.common import PromptedProvider
+from app.ai.http import get_http_client
+from app.config import settings
 
+API_VERSION = "2023-06-01"
 
-class AnthropicProvider(AIProvider):
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
-        self.api_key = api_key
-        self.model = model
 
-    async def generate_questions(
+class AnthropicProvider(PromptedProvider):
+    """Messages API over the shared HTTP pool."""
+
+    name = "anthropic"
+    label = "Anthropic"
+
+    def __init__(
         self,
-        transcript_chunk: str,
-        num_questions: int = 4,
-        existing_questions: list[str] | None = None,
-    ) -> list[GeneratedQuestion]:
-        raise NotImplementedError("Anthropic provider not yet implemented")
-
-    async def health_check(self) -> bool:
-        return False
+        api_key: str,
+        model: str = "claude-sonnet-4-20250514",
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ):
+        super().__init__(model, timeout, max_retries)
+        self.api_key = api_key
+        self.base_url = (base_url or settings.anthropic_base_url).rstrip("/")
+
+    @property
+    def _headers(self) -> dict:
+        return {"x-api-key": self.api_key, "anthropic-version": API_VERSION}
+
+    async def _complete(self, system_prompt: str, user_prompt: str) -> str:
+        response = await get_http_client().post(
+            f"{self.base_url}/v1/messages",
+            headers=self._headers,
+            json={
+                "model": self.model,
+                "max_tokens": settings.anthropic_max_tokens,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": user_prompt}],
+                "temperature": 0.7,
+            },
+        )
+        response.raise_for_status()
+        return "".join(
+            block["text"] for block in response.json()["content"] if block["type"] == "text"
+        )
+
+    async def _probe(self) -> None:
+        response = await get_http_client().get(
+            f"{self.base_url}/v1/models/{self.model}", headers=self._headers
+        )
+        response.raise_for_status()
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 
 from pydantic import BaseModel
 
+from app.ai.prompts import SYSTEM_PROMPT
+
 
 class GeneratedChoice(BaseModel):
     id: str
@@ -18,15 +20,36 @@ class GeneratedQuestion(BaseModel):
 
 
 class AIProvider(ABC):
+    name: str = ""
+    model: str = ""
+    system_prompt: str = SYSTEM_PROMPT
+    # True when generate_questions_batch packs chunks into a single request.
+    supports_batching: bool = False
+
     @abstractmethod
     async def generate_questions(
         self,
         transcript_chunk: str,
         num_questions: int = 4,
-        existing_questions: list[str] | None = None,
     ) -> list[GeneratedQuestion]:
         ...
 
+    async def generate_questions_batch(
+        self,
+        transcript_chunks: list[str],
+        num_questions: int = 4,
+    ) -> list[list[GeneratedQuestion]]:
+        """Generate questions for several chunks; one list per chunk, in order.
+
+        The default makes one `generate_questions` call per chunk, one after
+        another. Providers that can answer for several chunks in one request
+        override this and set `supports_batching`.
+        """
+        return [
+            await self.generate_questions(transcript_chunk=chunk, num_questions=num_questions)
+            for chunk in transcript_chunks
+        ]
+
     @abstractmethod
     async def health_check(self) -> bool:
         ...
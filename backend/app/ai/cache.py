@@ -0,0 +1,178 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from app.ai.base import AIProvider, GeneratedQuestion
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(provider: AIProvider, transcript_chunk: str, num_questions: int) -> str:
+    payload = json.dumps(
+        [provider.name, provider.model, provider.system_prompt, transcript_chunk, num_questions]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store of generated questions with TTL and LRU eviction.
+
+    Lookups and writes are blocking, so the async helpers run them in a
+    worker thread. `hits` and `misses` count lookups since process start.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, payload, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.commit()
+
+    async def aget(self, key: str) -> str | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, payload: str) -> None:
+        await asyncio.to_thread(self.put, key, payload)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class CachedAIProvider(AIProvider):
+    """Wraps any AIProvider and serves repeated chunks from a ResponseCache."""
+
+    def __init__(self, inner: AIProvider, cache: ResponseCache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+        self.model = inner.model
+        self.system_prompt = inner.system_prompt
+        self.supports_batching = inner.supports_batching
+
+    async def generate_questions(
+        self,
+        transcript_chunk: str,
+        num_questions: int = 4,
+    ) -> list[GeneratedQuestion]:
+        [questions] = await self.generate_questions_batch([transcript_chunk], num_questions)
+        return questions
+
+    async def generate_questions_batch(
+        self,
+        transcript_chunks: list[str],
+        num_questions: int = 4,
+    ) -> list[list[GeneratedQuestion]]:
+        """Serve cached chunks and send only the misses to the provider, as one batch.
+
+        Entries are per chunk, so a chunk cached from a single request is a
+        hit inside a batch and vice versa.
+        """
+        keys = [cache_key(self.inner, chunk, num_questions) for chunk in transcript_chunks]
+        results: list[list[GeneratedQuestion] | None] = []
+        for key in keys:
+            try:
+                payload = await self.cache.aget(key)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {e}")
+                payload = None
+            results.append(
+                None
+                if payload is None
+                else [GeneratedQuestion.model_validate(q) for q in json.loads(payload)]
+            )
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        if len(misses) == 1:
+            generated = [
+                await self.inner.generate_questions(
+                    transcript_chunk=transcript_chunks[misses[0]],
+                    num_questions=num_questions,
+                )
+            ]
+        else:
+            generated = await self.inner.generate_questions_batch(
+                [transcript_chunks[i] for i in misses], num_questions
+            )
+
+        for i, questions in zip(misses, generated):
+            results[i] = questions
+            # Providers return [] when they give up on a chunk; don't pin that.
+            if questions:
+                try:
+                    await self.cache.aput(
+                        keys[i], json.dumps([q.model_dump() for q in questions])
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache write failed: {e}")
+
+        return results
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
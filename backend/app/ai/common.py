@@ -0,0 +1,198 @@
+import json
+import re
+import uuid
+import asyncio
+import logging
+from abc import abstractmethod
+from collections.abc import Callable
+from typing import TypeVar
+
+from app.ai.base import AIProvider, GeneratedQuestion, GeneratedChoice
+from app.ai.prompts import (
+    BATCH_SYSTEM_PROMPT,
+    SYSTEM_PROMPT,
+    build_batch_user_prompt,
+    build_user_prompt,
+)
+from app.ai.retry import backoff_delay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def load_json(text: str):
+    # Strip markdown code fences if present
+    cleaned = text.strip()
+    cleaned = re.sub(r"^```(?:json)?\s*\n?", "", cleaned)
+    cleaned = re.sub(r"\n?```\s*$", "", cleaned)
+    return json.loads(cleaned)
+
+
+def parse_questions(questions_data) -> list[GeneratedQuestion]:
+    """Build GeneratedQuestions from a reply's questions array, skipping malformed ones."""
+    if not isinstance(questions_data, list):
+        raise TypeError(f"Expected list of questions, got {type(questions_data)}")
+
+    result = []
+    for q in questions_data:
+        try:
+            choices = []
+            correct_id = None
+            for c in q["choices"]:
+                choice_id = str(uuid.uuid4())[:8]
+                choices.append(
+                    GeneratedChoice(
+                        id=choice_id,
+                        text=c["text"],
+                        is_correct=c.get("is_correct", False),
+                    )
+                )
+                if c.get("is_correct", False):
+                    correct_id = choice_id
+
+            if not correct_id or len(choices) != 4:
+                continue
+
+            result.append(
+                GeneratedQuestion(
+                    question_text=q["question_text"],
+                    choices=choices,
+                    correct_choice_id=correct_id,
+                    explanation=q.get("explanation", ""),
+                    difficulty=q.get("difficulty", "medium"),
+                )
+            )
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Skipping malformed question: {e}")
+            continue
+
+    return result
+
+
+def parse_response(text: str) -> list[GeneratedQuestion]:
+    data = load_json(text)
+    questions_data = data.get("questions", data) if isinstance(data, dict) else data
+    return parse_questions(questions_data)
+
+
+def parse_batch_response(text: str) -> dict[str, list[GeneratedQuestion]]:
+    data = load_json(text)
+    chunks_data = data.get("chunks", data) if isinstance(data, dict) else data
+
+    if not isinstance(chunks_data, list):
+        raise TypeError(f"Expected list of chunks, got {type(chunks_data)}")
+
+    return {
+        str(chunk["chunk_id"]): parse_questions(chunk["questions"]) for chunk in chunks_data
+    }
+
+
+class PromptedProvider(AIProvider):
+    """A provider driven by the shared prompts and JSON reply format.
+
+    Subclasses only send one system + user prompt and return the reply text
+    (`_complete`); retries, batching and parsing live here.
+    """
+
+    supports_batching = True
+    label = ""
+
+    def __init__(self, model: str, timeout: float | None = None, max_retries: int | None = None):
+        self.model = model
+        self.timeout = timeout or settings.ai_request_timeout
+        self.max_retries = settings.ai_max_retries if max_retries is None else max_retries
+
+    @abstractmethod
+    async def _complete(self, system_prompt: str, user_prompt: str) -> str:
+        ...
+
+    @abstractmethod
+    async def _probe(self) -> None:
+        """Make a cheap authenticated request; raise if the provider is unusable."""
+        ...
+
+    async def generate_questions(
+        self,
+        transcript_chunk: str,
+        num_questions: int = 4,
+    ) -> list[GeneratedQuestion]:
+        user_prompt = build_user_prompt(transcript_chunk, num_questions)
+        result = await self._generate(user_prompt, SYSTEM_PROMPT, parse_response)
+        if result is None:
+            logger.error(
+                f"{self.label} failed after {self.max_retries + 1} attempts, skipping chunk"
+            )
+            return []
+        return result
+
+    async def generate_questions_batch(
+        self,
+        transcript_chunks: list[str],
+        num_questions: int = 4,
+    ) -> list[list[GeneratedQuestion]]:
+        """Ask for every chunk's questions in one request, keyed by chunk id.
+
+        Chunks the response leaves out (or all of them, if the batch request
+        fails) are retried one request each.
+        """
+        if len(transcript_chunks) == 1:
+            return [await self.generate_questions(transcript_chunks[0], num_questions)]
+
+        chunks = {f"c{i + 1}": text for i, text in enumerate(transcript_chunks)}
+        user_prompt = build_batch_user_prompt(chunks, num_questions)
+        by_chunk = await self._generate(user_prompt, BATCH_SYSTEM_PROMPT, parse_batch_response)
+        by_chunk = by_chunk or {}
+
+        missing = [chunk_id for chunk_id in chunks if chunk_id not in by_chunk]
+        if missing:
+            logger.warning(
+                f"{self.label} batch returned {len(chunks) - len(missing)}/{len(chunks)} chunks,"
+                " retrying the rest one by one"
+            )
+            retried = await asyncio.gather(
+                *(self.generate_questions(chunks[chunk_id], num_questions) for chunk_id in missing)
+            )
+            by_chunk.update(zip(missing, retried))
+
+        return [by_chunk[chunk_id] for chunk_id in chunks]
+
+    async def _generate(
+        self, user_prompt: str, system_prompt: str, parse: Callable[[str], T]
+    ) -> T | None:
+        """Send one request with retries and parse the reply; None once retries run out."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                text = await asyncio.wait_for(
+                    self._complete(system_prompt, user_prompt), timeout=self.timeout
+                )
+                return parse(text)
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.warning(f"{self.label} parse error (attempt {attempt + 1}): {e}")
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"{self.label} request timed out after {self.timeout}s"
+                    f" (attempt {attempt + 1})"
+                )
+            except Exception as e:
+                logger.error(f"{self.label} API error: {e}")
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt))
+
+        return None
+
+    async def health_check(self) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.wait_for(self._probe(), timeout=self.timeout)
+                return True
+            except Exception as e:
+                logger.warning(f"{self.label} health check failed (attempt {attempt + 1}): {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff(attempt))
+        return False
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return backoff_delay(attempt, settings.ai_backoff_base, settings.ai_backoff_max)
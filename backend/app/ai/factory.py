@@ -1,22 +1,81 @@
 from app.ai.base import AIProvider
+from app.ai.cache import CachedAIProvider, ResponseCache
+from app.ai.hedged import HedgedProvider
 from app.config import Settings
 
+_response_cache: ResponseCache | None = None
+_hedged_provider: HedgedProvider | None = None
+
+
+def get_response_cache(config: Settings) -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            path=config.llm_cache_path,
+            ttl_seconds=config.llm_cache_ttl_seconds,
+            max_entries=config.llm_cache_max_entries,
+        )
+    return _response_cache
+
 
 def get_ai_provider(config: Settings) -> AIProvider:
-    match config.ai_provider:
+    provider = _get_hedged_or_single(config)
+    if config.llm_cache_enabled:
+        return CachedAIProvider(provider, get_response_cache(config))
+    return provider
+
+
+def _get_hedged_or_single(config: Settings) -> AIProvider:
+    global _hedged_provider
+    names = [name.strip() for name in config.ai_provider.split(",") if name.strip()]
+    if len(names) == 1:
+        return _create_provider(config, names[0])
+    # Shared so the latency percentiles cover every ingest, not just one.
+    if _hedged_provider is None or [p.name for p in _hedged_provider.providers] != names:
+        # Members make a single attempt so an error fails over at once;
+        # HedgedProvider retries the round instead.
+        _hedged_provider = HedgedProvider(
+            [_create_provider(config, name, max_retries=0) for name in names],
+            hedge_percentile=config.ai_hedge_percentile,
+            initial_delay=config.ai_hedge_initial_delay,
+            min_samples=config.ai_hedge_min_samples,
+            window=config.ai_hedge_window,
+            max_retries=config.ai_max_retries,
+        )
+    return _hedged_provider
+
+
+def get_hedged_provider() -> HedgedProvider | None:
+    return _hedged_provider
+
+
+def _create_provider(config: Settings, name: str, max_retries: int | None = None) -> AIProvider:
+    match name:
         case "gemini":
             from app.ai.gemini import GeminiProvider
 
-            return GeminiProvider(api_key=config.gemini_api_key, model=config.gemini_model)
+            return GeminiProvider(
+                api_key=config.gemini_api_key,
+                model=config.gemini_model,
+                max_retries=max_retries,
+            )
         case "openai":
             from app.ai.openai import OpenAIProvider
 
-            return OpenAIProvider(api_key=config.openai_api_key, model=config.openai_model)
+            return OpenAIProvider(
+                api_key=config.openai_api_key,
+                model=config.openai_model,
+                base_url=config.openai_base_url,
+                max_retries=max_retries,
+            )
         case "anthropic":
             from app.ai.anthropic import AnthropicProvider
 
             return AnthropicProvider(
-                api_key=config.anthropic_api_key, model=config.anthropic_model
+                api_key=config.anthropic_api_key,
+                model=config.anthropic_model,
+                base_url=config.anthropic_base_url,
+                max_retries=max_retries,
             )
         case _:
-            raise ValueError(f"Unknown AI provider: {config.ai_provider}")
+            raise ValueError(f"Unknown AI provider: {name}")
@@ -0,0 +1,202 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.ai.base import AIProvider, GeneratedQuestion
+from app.ai.retry import backoff_delay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Recent successful latencies of one provider and request kind."""
+
+    def __init__(self, window: int):
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class HedgedProvider(AIProvider):
+    """Send each request to the first provider, and to the next as a hedge or failover.
+
+    If a provider has not answered by the `hedge_percentile` of its recent
+    latencies (or `initial_delay` until it has `min_samples` of them), the
+    same request also goes to the next provider, and whichever answers first
+    wins; the others are cancelled. A provider that raises or gives up (an
+    empty result) hands over to the next one straight away, so the providers
+    should be built with `max_retries=0`: retries and latencies are then per
+    attempt, and retrying is left to this class. When every provider has
+    failed, the whole round is retried up to `max_retries` times with backoff
+    before the request fails.
+    """
+
+    name = "hedged"
+
+    def __init__(
+        self,
+        providers: list[AIProvider],
+        hedge_percentile: float = 95.0,
+        initial_delay: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_retries: int | None = None,
+    ):
+        self.providers = providers
+        self.max_retries = settings.ai_max_retries if max_retries is None else max_retries
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.model = ",".join(f"{p.name}:{p.model}" for p in providers)
+        self.system_prompt = providers[0].system_prompt
+        self.supports_batching = providers[0].supports_batching
+        self._latencies: dict[tuple[int, str], LatencyTracker] = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def _tracker(self, index: int, kind: str) -> LatencyTracker:
+        key = (index, kind)
+        if key not in self._latencies:
+            self._latencies[key] = LatencyTracker(self.window)
+        return self._latencies[key]
+
+    def hedge_delay(self, index: int, kind: str) -> float:
+        tracker = self._tracker(index, kind)
+        if len(tracker.samples) < self.min_samples:
+            return self.initial_delay
+        return tracker.percentile(self.hedge_percentile)
+
+    async def _hedged(
+        self, kind: str, call: Callable[[AIProvider], Awaitable[T]], failed: Callable[[T], bool]
+    ) -> T | None:
+        """Run `call` against the providers as described above, retrying failed rounds.
+
+        Returns the first successful result; failing that, the first failed
+        result a provider returned in the last round, or None.
+        """
+        for attempt in range(self.max_retries + 1):
+            result = await self._round(kind, call, failed)
+            if result is not None and not failed(result):
+                return result
+            if attempt < self.max_retries:
+                logger.warning(f"Every provider failed (attempt {attempt + 1}), retrying")
+                await asyncio.sleep(
+                    backoff_delay(attempt, settings.ai_backoff_base, settings.ai_backoff_max)
+                )
+        return result
+
+    async def _round(
+        self, kind: str, call: Callable[[AIProvider], Awaitable[T]], failed: Callable[[T], bool]
+    ) -> T | None:
+        """One pass over the providers: hedge on slow ones, fail over on errors."""
+        running: dict[asyncio.Task, tuple[int, float]] = {}
+        next_index = 0
+        result: T | None = None
+
+        def launch() -> None:
+            nonlocal next_index
+            provider = self.providers[next_index]
+            task = asyncio.create_task(call(provider), name=f"ai-{provider.name}")
+            running[task] = (next_index, time.perf_counter())
+            next_index += 1
+
+        launch()
+        try:
+            while running:
+                more = next_index < len(self.providers)
+                # Hedge on the most recently started provider's latency.
+                newest = max(running.values(), key=lambda started: started[1])
+                timeout = None
+                if more:
+                    elapsed = time.perf_counter() - newest[1]
+                    timeout = max(0.0, self.hedge_delay(newest[0], kind) - elapsed)
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    self.hedges += 1
+                    logger.info(
+                        f"{self.providers[newest[0]].name} slower than its hedge delay,"
+                        f" also asking {self.providers[next_index].name}"
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    index, started = running.pop(task)
+                    try:
+                        value = task.result()
+                    except Exception as e:
+                        logger.warning(f"{self.providers[index].name} failed: {e}")
+                        value = None
+                    if value is not None and not failed(value):
+                        self._tracker(index, kind).record(time.perf_counter() - started)
+                        if index > 0 and running:
+                            self.hedge_wins += 1
+                        return value
+                    result = value if result is None else result
+
+                if not running and more:
+                    self.failovers += 1
+                    logger.warning(f"Failing over to {self.providers[next_index].name}")
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        return result
+
+    async def generate_questions(
+        self,
+        transcript_chunk: str,
+        num_questions: int = 4,
+    ) -> list[GeneratedQuestion]:
+        result = await self._hedged(
+            "single",
+            lambda provider: provider.generate_questions(
+                transcript_chunk=transcript_chunk, num_questions=num_questions
+            ),
+            lambda questions: not questions,
+        )
+        return result or []
+
+    async def generate_questions_batch(
+        self,
+        transcript_chunks: list[str],
+        num_questions: int = 4,
+    ) -> list[list[GeneratedQuestion]]:
+        result = await self._hedged(
+            "batch",
+            lambda provider: provider.generate_questions_batch(transcript_chunks, num_questions),
+            lambda results: not any(results),
+        )
+        return result or [[] for _ in transcript_chunks]
+
+    async def health_check(self) -> bool:
+        checks = await asyncio.gather(
+            *(p.health_check() for p in self.providers), return_exceptions=True
+        )
+        return any(check is True for check in checks)
+
+    def stats(self) -> dict:
+        return {
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
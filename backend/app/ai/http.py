@@ -0,0 +1,28 @@
+import httpx
+
+from app.config import settings
+
+# One connection pool for every HTTP-based provider, so hedged and retried
+# requests reuse warm connections instead of opening new ones.
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.ai_http_max_connections,
+                max_keepalive_connections=settings.ai_http_max_connections,
+            ),
+            # Each request is bounded by the provider's own timeout.
+            timeout=None,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
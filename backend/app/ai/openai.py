@@ -1,18 +1,49 @@
-from app.ai.base import AIProvider, GeneratedQuestion
+from app.ai.common import PromptedProvider
+from app.ai.http import get_http_client
+from app.config import settings
 
 
-class OpenAIProvider(AIProvider):
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        self.api_key = api_key
-        self.model = model
+class OpenAIProvider(PromptedProvider):
+    """Chat Completions over the shared HTTP pool, in JSON mode."""
+
+    name = "openai"
+    label = "OpenAI"
 
-    async def generate_questions(
+    def __init__(
         self,
-        transcript_chunk: str,
-        num_questions: int = 4,
-        existing_questions: list[str] | None = None,
-    ) -> list[GeneratedQuestion]:
-        raise NotImplementedError("OpenAI provider not yet implemented")
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+    ):
+        super().__init__(model, timeout, max_retries)
+        self.api_key = api_key
+        self.base_url = (base_url or settings.openai_base_url).rstrip("/")
+
+    @property
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def _complete(self, system_prompt: str, user_prompt: str) -> str:
+        response = await get_http_client().post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers,
+            json={
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.7,
+            },
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
 
-    async def health_check(self) -> bool:
-        return False
+    async def _probe(self) -> None:
+        response = await get_http_client().get(
+            f"{self.base_url}/models/{self.model}", headers=self._headers
+        )
+        response.raise_for_status()
@@ -0,0 +1,50 @@
+SYSTEM_PROMPT = """You are an expert educational assessment designer. Your task is to create multiple-choice quiz questions that test comprehension of video content.
+
+Rules:
+1. Each question must have exactly 4 answer choices labeled A, B, C, D.
+2. Exactly one choice must be correct.
+3. Wrong choices (distractors) must be plausible but clearly incorrect.
+4. Questions should test understanding, not trivial memorization.
+5. Cover different cognitive levels: recall, comprehension, application.
+6. Each question must include a brief explanation of why the correct answer is right.
+7. Assign a difficulty: "easy", "medium", or "hard".
+8. Vary question types: factual, conceptual, cause-effect, comparison.
+9. Make questions self-contained — answerable without watching the video.
+
+Return a JSON object with a "questions" array. Each question has:
+- "question_text": the question
+- "choices": array of 4 objects with "label" (A/B/C/D), "text", and "is_correct" (boolean)
+- "explanation": why the correct answer is right
+- "difficulty": "easy", "medium", or "hard"
+
+IMPORTANT: Return ONLY valid JSON. No markdown, no code fences, no extra text.
+"""
+
+
+def build_user_prompt(transcript_chunk: str, num_questions: int) -> str:
+    user_prompt = f"Generate {num_questions} multiple-choice questions from this video transcript segment.\n\nTRANSCRIPT:\n---\n{transcript_chunk}\n---\n"
+
+    user_prompt += "\nReturn the questions as a JSON object with a 'questions' array. Only valid JSON, nothing else."
+    return user_prompt
+
+
+BATCH_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT
+    + """
+When the user sends several transcript segments, each marked with a chunk id, write the questions for each segment from that segment alone. Return a JSON object with a "chunks" array instead, one entry per segment: {"chunk_id": the segment's id, "questions": the questions array described above}.
+"""
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for request budgeting."""
+    return len(text) // 4 + 1
+
+
+def build_batch_user_prompt(chunks: dict[str, str], num_questions: int) -> str:
+    user_prompt = f"Generate {num_questions} multiple-choice questions for each of these {len(chunks)} video transcript segments.\n"
+    for chunk_id, text in chunks.items():
+        user_prompt += f"\nCHUNK {chunk_id}:\n---\n{text}\n---\n"
+
+    user_prompt += "\nReturn a JSON object with a 'chunks' array holding one entry per chunk id, each with 'chunk_id' and 'questions'. Only valid JSON, nothing else."
+    return user_prompt
@@ -5,23 +5,85 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/app.db"
 
-    # AI Provider
+    # Connection pool (server databases such as postgresql+asyncpg)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # SQLite connection profile, applied on every new connection
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 64 * 1024
+    sqlite_mmap_size_mb: int = 256
+    sqlite_temp_store: str = "memory"
+    sqlite_foreign_keys: bool = True
+
+    # AI Provider; a comma-separated list (e.g. "gemini,openai") hedges
+    # across them in that order
     ai_provider: str = "gemini"
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.5-flash"
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
+    openai_base_url: str = "https://api.openai.com/v1"
     anthropic_api_key: str = ""
     anthropic_model: str = "claude-sonnet-4-20250514"
+    anthropic_base_url: str = "https://api.anthropic.com"
+    anthropic_max_tokens: int = 8192
+    ai_http_max_connections: int = 20
+    ai_request_timeout: float = 60.0
+    ai_max_retries: int = 2
+    ai_backoff_base: float = 1.0
+    ai_backoff_max: float = 10.0
+    # Chunks packed into one request by providers that support batching
+    ai_batch_token_budget: int = 4000
+    ai_batch_max_chunks: int = 8
+    # Hedged requests across several providers
+    ai_hedge_percentile: float = 95.0
+    ai_hedge_initial_delay: float = 10.0
+    ai_hedge_min_samples: int = 20
+    ai_hedge_window: int = 200
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "./data/llm_cache.db"
+    llm_cache_ttl_seconds: int = 30 * 24 * 3600
+    llm_cache_max_entries: int = 50_000
+
+    # Review event log (write-behind)
+    review_log_batch_size: int = 200
+    review_log_flush_ms: int = 500
+    review_log_max_pending: int = 10_000
+
+    # Pagination
+    default_page_size: int = 50
+    max_page_size: int = 200
+
+    # Learners: requests act for the X-User-Id header, or this user without it
+    default_user_id: str = "default"
 
     # Quiz settings
     default_session_size: int = 15
     max_session_size: int = 20
     min_session_size: int = 5
     max_review_per_session: int = 10
+    max_answer_batch_size: int = 100
+    due_index_enabled: bool = True
+    due_index_max_users: int = 1000
     questions_per_chunk: int = 4
     transcript_chunk_words: int = 600
     transcript_chunk_overlap: int = 50
+    transcript_language: str = "en"
+    transcript_fetch_workers: int = 4
+    transcript_cache_dir: str = "./data/transcripts"
+    transcript_cache_max_mb: int = 256
+    generation_concurrency: int = 4
+    # Estimated Jaccard similarity of question + correct answer texts at which one is dropped
+    near_duplicate_threshold: float = 0.8
+    ingest_workers: int = 2
 
     # SM-2 tuning
     sm2_first_interval: float = 1.0
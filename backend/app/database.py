@@ -1,9 +1,58 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from pathlib import Path
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-from app.config import settings
+from app.config import Settings, settings
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def sqlite_pragmas(config: Settings = settings) -> dict[str, str | int]:
+    """The per-connection SQLite profile from settings, in the order it is applied."""
+    return {
+        "journal_mode": config.sqlite_journal_mode,
+        "synchronous": config.sqlite_synchronous,
+        "busy_timeout": config.sqlite_busy_timeout_ms,
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -config.sqlite_cache_size_kb,
+        "mmap_size": config.sqlite_mmap_size_mb * 1024 * 1024,
+        "temp_store": config.sqlite_temp_store,
+        "foreign_keys": "ON" if config.sqlite_foreign_keys else "OFF",
+    }
+
+
+def apply_sqlite_pragmas(db_engine: AsyncEngine, pragmas: dict[str, str | int]) -> None:
+    """Run `pragmas` on every new DBAPI connection the engine opens."""
+
+    @event.listens_for(db_engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def make_engine(url: str, config: Settings = settings) -> AsyncEngine:
+    if make_url(url).get_backend_name() == "sqlite":
+        db_engine = create_async_engine(url, echo=False)
+        apply_sqlite_pragmas(db_engine, sqlite_pragmas(config))
+        return db_engine
 
-engine = create_async_engine(settings.database_url, echo=False)
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+
+
+engine = make_engine(settings.database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -16,9 +65,40 @@ async def get_db() -> AsyncSession:
         yield session
 
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        await conn.execute(
-            __import__("sqlalchemy").text("PRAGMA journal_mode=WAL")
-        )
+def run_migrations(connection: Connection) -> None:
+    """Upgrade the schema to the latest Alembic revision on `connection`."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+# Arbitrary key for the advisory lock that serializes startup migrations
+# across API replicas.
+MIGRATION_LOCK_ID = 0x6C7475626531
+
+
+async def init_db(db_engine: AsyncEngine = engine):
+    dialect = db_engine.dialect.name
+    async with db_engine.connect() as conn:
+        if dialect == "postgresql":
+            # Replicas starting together take turns; later ones find the
+            # schema already at head.
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+            )
+        elif dialect == "sqlite":
+            # Batch migrations rebuild tables with DROP TABLE, which would
+            # cascade through enforced foreign keys. The pragma only takes
+            # effect outside a transaction, so it is toggled around it.
+            await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+
+        await conn.run_sync(run_migrations)
+        await conn.commit()
+
+        if dialect == "sqlite":
+            await conn.exec_driver_sql(
+                f"PRAGMA foreign_keys={sqlite_pragmas()['foreign_keys']}"
+            )
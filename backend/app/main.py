@@ -3,14 +3,27 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.ai.factory import get_hedged_provider, get_response_cache
+from app.ai.http import close_http_client
+from app.config import settings
 from app.database import init_db
-from app.routers import videos, quiz, progress
+from app.routers import videos, quiz, progress, admin
+from app.services.due_index import due_index
+from app.services.ingest import ingest_pool
+from app.services.review_log import review_log
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    if settings.due_index_enabled:
+        await due_index.build()
+    await ingest_pool.start()
+    review_log.start()
     yield
+    await ingest_pool.stop()
+    await review_log.stop()
+    await close_http_client()
 
 
 app = FastAPI(title="YouTube Learning Tool", version="1.0.0", lifespan=lifespan)
@@ -26,8 +39,15 @@ app.add_middleware(
 app.include_router(videos.router)
 app.include_router(quiz.router)
 app.include_router(progress.router)
+app.include_router(admin.router)
 
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok"}
+    status = {"status": "ok", "review_log": review_log.stats()}
+    if settings.llm_cache_enabled:
+        status["llm_cache"] = get_response_cache(settings).stats()
+    hedged = get_hedged_provider()
+    if hedged is not None:
+        status["ai_hedging"] = hedged.stats()
+    return status
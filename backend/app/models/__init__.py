@@ -1,5 +1,21 @@
 from app.models.video import Video
 from app.models.question import Question
-from app.models.progress import UserProgress, DailyStats
+from app.models.question_signature import QuestionSignature, QuestionLshBucket
+from app.models.transcript import VideoTranscript
+from app.models.progress import UserProgress, DailyStats, StreakState, UserVideoMastery
+from app.models.review_event import ReviewEvent
+from app.models.job import IngestJob
 
-__all__ = ["Video", "Question", "UserProgress", "DailyStats"]
+__all__ = [
+    "Video",
+    "VideoTranscript",
+    "Question",
+    "QuestionSignature",
+    "QuestionLshBucket",
+    "UserProgress",
+    "DailyStats",
+    "StreakState",
+    "UserVideoMastery",
+    "ReviewEvent",
+    "IngestJob",
+]
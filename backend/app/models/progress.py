@@ -1,34 +1,44 @@
 import uuid
 from datetime import datetime, date, timezone
 
-from sqlalchemy import String, Integer, Float, DateTime, Date, ForeignKey
+from sqlalchemy import String, Integer, Float, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
 class UserProgress(Base):
+    """One learner's SM-2 state for one question, created on their first answer."""
+
     __tablename__ = "user_progress"
+    __table_args__ = (
+        Index("ix_user_progress_user_question", "user_id", "question_id", unique=True),
+        Index("ix_user_progress_user_due", "user_id", "next_review_at"),
+        Index("ix_user_progress_user_ease", "user_id", "ease_factor"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(String)
     question_id: Mapped[str] = mapped_column(
-        String, ForeignKey("questions.id", ondelete="CASCADE"), unique=True, index=True
+        String, ForeignKey("questions.id", ondelete="CASCADE"), index=True
     )
     repetitions: Mapped[int] = mapped_column(Integer, default=0)
     ease_factor: Mapped[float] = mapped_column(Float, default=2.5)
     interval_days: Mapped[float] = mapped_column(Float, default=0.0)
     next_review_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    last_reviewed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
     )
-    last_reviewed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     times_correct: Mapped[int] = mapped_column(Integer, default=0)
     times_incorrect: Mapped[int] = mapped_column(Integer, default=0)
     streak: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
+        DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
@@ -38,12 +48,43 @@ class UserProgress(Base):
 
 class DailyStats(Base):
     __tablename__ = "daily_stats"
+    __table_args__ = (Index("ix_daily_stats_user_date", "user_id", "date", unique=True),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    date: Mapped[date] = mapped_column(Date, unique=True, index=True)
+    user_id: Mapped[str] = mapped_column(String)
+    date: Mapped[date] = mapped_column(Date)
     questions_answered: Mapped[int] = mapped_column(Integer, default=0)
     questions_correct: Mapped[int] = mapped_column(Integer, default=0)
     session_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class StreakState(Base):
+    """A learner's running streak, advanced by each completed session."""
+
+    __tablename__ = "streak_state"
+
+    user_id: Mapped[str] = mapped_column(String, primary_key=True)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_active_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class UserVideoMastery(Base):
+    """How many of a video's questions one learner has mastered."""
+
+    __tablename__ = "video_mastery"
+    __table_args__ = (Index("ix_video_mastery_video", "video_id"),)
+
+    user_id: Mapped[str] = mapped_column(String, primary_key=True)
+    video_id: Mapped[str] = mapped_column(
+        String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
     )
+    mastered_count: Mapped[int] = mapped_column(Integer, default=0)
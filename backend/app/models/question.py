@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import String, Text, Float, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -9,19 +10,23 @@ from app.database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_video_segment", "video_id", "segment_start"),
+        Index("ix_questions_video_created", "video_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     video_id: Mapped[str] = mapped_column(String, ForeignKey("videos.id", ondelete="CASCADE"))
     question_text: Mapped[str] = mapped_column(Text)
-    choices: Mapped[list] = mapped_column(JSON)
+    choices: Mapped[list] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
     correct_choice_id: Mapped[str] = mapped_column(String)
     explanation: Mapped[str] = mapped_column(Text, default="")
     segment_start: Mapped[float | None] = mapped_column(Float, nullable=True)
     segment_end: Mapped[float | None] = mapped_column(Float, nullable=True)
     difficulty: Mapped[str] = mapped_column(String, default="medium")
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
     video = relationship("Video", back_populates="questions")
-    progress = relationship("UserProgress", back_populates="question", uselist=False, cascade="all, delete-orphan")
+    progress = relationship("UserProgress", back_populates="question", cascade="all, delete-orphan")
@@ -0,0 +1,30 @@
+from sqlalchemy import String, BigInteger, LargeBinary, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class QuestionSignature(Base):
+    """MinHash signature of a question's text and correct answer (little-endian uint32s)."""
+
+    __tablename__ = "question_signatures"
+
+    question_id: Mapped[str] = mapped_column(
+        String, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
+    signature: Mapped[bytes] = mapped_column(LargeBinary)
+
+
+class QuestionLshBucket(Base):
+    """One LSH band of a question's signature, hashed to a bucket.
+
+    Questions sharing any bucket are candidate near-duplicates.
+    """
+
+    __tablename__ = "question_lsh_buckets"
+    __table_args__ = (Index("ix_question_lsh_buckets_question", "question_id"),)
+
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    question_id: Mapped[str] = mapped_column(
+        String, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
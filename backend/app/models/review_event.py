@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Float, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ReviewEvent(Base):
+    """One graded answer, appended and never updated.
+
+    Carries the SM-2 interval and ease before and after the answer so the
+    scheduling history can be analyzed or replayed.
+    """
+
+    __tablename__ = "review_events"
+    __table_args__ = (
+        Index("ix_review_events_question_reviewed", "question_id", "reviewed_at"),
+        Index("ix_review_events_user_reviewed", "user_id", "reviewed_at"),
+    )
+
+    # Integer key so appends go to the end of the table's b-tree.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(String)
+    question_id: Mapped[str] = mapped_column(
+        String, ForeignKey("questions.id", ondelete="CASCADE")
+    )
+    reviewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    is_correct: Mapped[bool] = mapped_column(Boolean)
+    prev_interval_days: Mapped[float] = mapped_column(Float)
+    new_interval_days: Mapped[float] = mapped_column(Float)
+    prev_ease_factor: Mapped[float] = mapped_column(Float)
+    new_ease_factor: Mapped[float] = mapped_column(Float)
@@ -0,0 +1,71 @@
+import sys
+import zlib
+from array import array
+
+from sqlalchemy import String, Integer, LargeBinary, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Segment texts are joined with NUL, which never occurs in caption text.
+SEGMENT_SEPARATOR = "\x00"
+
+
+def pack_floats(values: list[float]) -> bytes:
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return zlib.compress(packed.tobytes())
+
+
+def unpack_floats(blob: bytes) -> array:
+    values = array("d")
+    values.frombytes(zlib.decompress(blob))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class VideoTranscript(Base):
+    """A video's transcript, stored apart from the videos row and compressed.
+
+    Segment texts are one zlib blob; start times and durations are zlib'd
+    little-endian float64 arrays.
+    """
+
+    __tablename__ = "video_transcripts"
+
+    video_id: Mapped[str] = mapped_column(
+        String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
+    )
+    segment_count: Mapped[int] = mapped_column(Integer, default=0)
+    texts: Mapped[bytes] = mapped_column(LargeBinary)
+    starts: Mapped[bytes] = mapped_column(LargeBinary)
+    durations: Mapped[bytes] = mapped_column(LargeBinary)
+
+    @classmethod
+    def from_segments(cls, segments: list[dict]) -> "VideoTranscript":
+        return cls(
+            segment_count=len(segments),
+            texts=zlib.compress(SEGMENT_SEPARATOR.join(s["text"] for s in segments).encode()),
+            starts=pack_floats([s["start"] for s in segments]),
+            durations=pack_floats([s["duration"] for s in segments]),
+        )
+
+    def segment_texts(self) -> list[str]:
+        if not self.segment_count:
+            return []
+        return zlib.decompress(self.texts).decode().split(SEGMENT_SEPARATOR)
+
+    @property
+    def full_text(self) -> str:
+        return " ".join(self.segment_texts())
+
+    @property
+    def segments(self) -> list[dict]:
+        return [
+            {"text": text, "start": start, "duration": duration}
+            for text, start, duration in zip(
+                self.segment_texts(), unpack_floats(self.starts), unpack_floats(self.durations)
+            )
+        ]
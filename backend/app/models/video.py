@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text, Integer, DateTime, JSON
+from sqlalchemy import String, Integer, DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,16 +16,18 @@ class Video(Base):
     title: Mapped[str] = mapped_column(String, default="")
     channel: Mapped[str | None] = mapped_column(String, nullable=True)
     thumbnail_url: Mapped[str] = mapped_column(String, default="")
-    transcript_text: Mapped[str] = mapped_column(Text, default="")
-    transcript_segments: Mapped[list] = mapped_column(JSON, default=list)
     question_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
+        DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
     questions = relationship("Question", back_populates="video", cascade="all, delete-orphan")
+    # Loaded explicitly where needed; the videos row itself stays small.
+    transcript = relationship(
+        "VideoTranscript", uselist=False, lazy="raise", cascade="all, delete-orphan"
+    )
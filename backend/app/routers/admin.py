@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.services.batch_scheduler import reschedule_all
+from app.services.due_index import due_index
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.post("/reschedule")
+async def reschedule_cards(db: AsyncSession = Depends(get_db)):
+    """Recompute every reviewed card's interval and due date from the current sm2_* settings."""
+    rescheduled = await reschedule_all(db)
+    if rescheduled:
+        due_index.forget_learners()
+    return {"rescheduled": rescheduled}
@@ -1,111 +1,124 @@
-from datetime import date
+import asyncio
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, true
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.database import get_db
 from app.models.video import Video
-from app.models.question import Question
-from app.models.progress import UserProgress, DailyStats
+from app.models.progress import DailyStats, StreakState, UserProgress, UserVideoMastery
 from app.schemas.progress import (
     ProgressOverview,
     VideoMastery,
     DailyStatsResponse,
     StreakResponse,
+    ForecastDay,
+    ReviewForecast,
 )
+from app.services.batch_scheduler import forecast_due_counts, load_progress_arrays
+from app.services.mastery import mastery_percentage
+from app.services.snapshot import overview_snapshot
+from app.services.streak import current_streak, get_streak_state
+from app.users import get_user_id
 
 router = APIRouter(prefix="/api/progress", tags=["progress"])
 
 
 @router.get("/overview", response_model=ProgressOverview)
-async def get_overview(db: AsyncSession = Depends(get_db)):
-    video_count = await db.scalar(select(func.count(Video.id)))
-    question_count = await db.scalar(select(func.count(Question.id)))
-
-    seen_count = await db.scalar(
-        select(func.count(UserProgress.id)).where(
-            UserProgress.last_reviewed_at.isnot(None)
+async def get_overview(
+    db: AsyncSession = Depends(get_db), user_id: str = Depends(get_user_id)
+):
+    return await overview_snapshot.get(lambda: _compute_overview(db, user_id), key=user_id)
+
+
+async def _compute_overview(db: AsyncSession, user_id: str) -> ProgressOverview:
+    # Question totals come from the per-video counters, mastery from the
+    # learner's per-video counters, answer totals from one pass over their
+    # progress rows, and the streak from their state row, all read in one
+    # statement.
+    video_totals = select(
+        func.count(Video.id).label("video_count"),
+        func.coalesce(func.sum(Video.question_count), 0).label("question_count"),
+    ).subquery()
+    mastery_totals = select(
+        func.coalesce(func.sum(UserVideoMastery.mastered_count), 0).label("mastered_count"),
+    ).where(UserVideoMastery.user_id == user_id).subquery()
+    progress_totals = select(
+        func.count(UserProgress.id).label("seen_count"),
+        func.coalesce(func.sum(UserProgress.times_correct), 0).label("total_correct"),
+        func.coalesce(func.sum(UserProgress.times_incorrect), 0).label("total_incorrect"),
+    ).where(UserProgress.user_id == user_id).subquery()
+
+    streak = select(StreakState).where(StreakState.user_id == user_id)
+    totals = (
+        await db.execute(
+            select(
+                video_totals,
+                mastery_totals,
+                progress_totals,
+                streak.with_only_columns(StreakState.current_streak)
+                .scalar_subquery()
+                .label("current_streak"),
+                streak.with_only_columns(StreakState.last_active_date)
+                .scalar_subquery()
+                .label("last_active_date"),
+            )
+            # Each subquery is one row; joining them explicitly says so (and
+            # keeps SQLAlchemy from warning about a cartesian product).
+            .select_from(
+                video_totals.join(mastery_totals, true()).join(progress_totals, true())
+            )
         )
-    )
-    mastered_count = await db.scalar(
-        select(func.count(UserProgress.id)).where(UserProgress.repetitions >= 3)
-    )
-    total_correct = await db.scalar(
-        select(func.coalesce(func.sum(UserProgress.times_correct), 0))
-    )
-    total_incorrect = await db.scalar(
-        select(func.coalesce(func.sum(UserProgress.times_incorrect), 0))
-    )
-
-    mastery_pct = round(mastered_count / question_count * 100, 1) if question_count else 0.0
-
-    streak = await _compute_streak(db)
+    ).one()
 
     return ProgressOverview(
-        total_videos=video_count or 0,
-        total_questions=question_count or 0,
-        questions_seen=seen_count or 0,
-        mastery_percentage=mastery_pct,
-        current_streak=streak,
-        total_correct=total_correct or 0,
-        total_incorrect=total_incorrect or 0,
+        total_videos=totals.video_count,
+        total_questions=totals.question_count,
+        questions_seen=totals.seen_count,
+        mastery_percentage=mastery_percentage(totals.mastered_count, totals.question_count),
+        current_streak=current_streak(totals),
+        total_correct=totals.total_correct,
+        total_incorrect=totals.total_incorrect,
     )
 
 
 @router.get("/videos/{video_id}", response_model=VideoMastery)
-async def get_video_mastery(video_id: str, db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(Video)
-        .where(Video.id == video_id)
-        .options(joinedload(Video.questions).joinedload(Question.progress))
-    )
-    result = await db.execute(stmt)
-    video = result.unique().scalar_one_or_none()
+async def get_video_mastery(
+    video_id: str,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    video = await db.get(Video, video_id)
 
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    mastered = sum(1 for q in video.questions if q.progress and q.progress.repetitions >= 3)
-    total = len(video.questions)
+    mastery = await db.get(UserVideoMastery, (user_id, video_id))
+    mastered = mastery.mastered_count if mastery else 0
 
     return VideoMastery(
         video_id=video.id,
         title=video.title,
         thumbnail_url=video.thumbnail_url,
-        total_questions=total,
+        total_questions=video.question_count,
         questions_mastered=mastered,
-        mastery_percentage=round(mastered / total * 100, 1) if total else 0.0,
+        mastery_percentage=mastery_percentage(mastered, video.question_count),
     )
 
 
 @router.get("/streak", response_model=StreakResponse)
-async def get_streak(db: AsyncSession = Depends(get_db)):
-    stmt = select(DailyStats).order_by(DailyStats.date.desc()).limit(90)
+async def get_streak(db: AsyncSession = Depends(get_db), user_id: str = Depends(get_user_id)):
+    stmt = (
+        select(DailyStats)
+        .where(DailyStats.user_id == user_id)
+        .order_by(DailyStats.date.desc())
+        .limit(90)
+    )
     result = await db.execute(stmt)
     all_stats = result.scalars().all()
 
-    current_streak = 0
-    longest_streak = 0
-    expected = date.today()
-    for s in all_stats:
-        if s.date == expected:
-            current_streak += 1
-            expected = date.fromordinal(expected.toordinal() - 1)
-        elif current_streak > 0:
-            break
-
-    # Compute longest streak from all stats
-    all_dates = sorted([s.date for s in all_stats])
-    temp_streak = 0
-    for i, d in enumerate(all_dates):
-        if i == 0 or d.toordinal() - all_dates[i - 1].toordinal() == 1:
-            temp_streak += 1
-        else:
-            longest_streak = max(longest_streak, temp_streak)
-            temp_streak = 1
-    longest_streak = max(longest_streak, temp_streak, current_streak)
+    state = await get_streak_state(db, user_id)
 
     calendar = [
         DailyStatsResponse(
@@ -122,15 +135,22 @@ async def get_streak(db: AsyncSession = Depends(get_db)):
     ]
 
     return StreakResponse(
-        current_streak=current_streak,
-        longest_streak=longest_streak,
+        current_streak=current_streak(state),
+        longest_streak=state.longest_streak,
         calendar=calendar,
     )
 
 
 @router.get("/daily", response_model=list[DailyStatsResponse])
-async def get_daily_stats(db: AsyncSession = Depends(get_db)):
-    stmt = select(DailyStats).order_by(DailyStats.date.desc()).limit(30)
+async def get_daily_stats(
+    db: AsyncSession = Depends(get_db), user_id: str = Depends(get_user_id)
+):
+    stmt = (
+        select(DailyStats)
+        .where(DailyStats.user_id == user_id)
+        .order_by(DailyStats.date.desc())
+        .limit(30)
+    )
     result = await db.execute(stmt)
     stats = result.scalars().all()
 
@@ -149,18 +169,20 @@ async def get_daily_stats(db: AsyncSession = Depends(get_db)):
     ]
 
 
-async def _compute_streak(db: AsyncSession) -> int:
-    stmt = select(DailyStats).order_by(DailyStats.date.desc())
-    result = await db.execute(stmt)
-    all_stats = result.scalars().all()
-
-    streak = 0
-    expected = date.today()
-    for s in all_stats:
-        if s.date == expected:
-            streak += 1
-            expected = date.fromordinal(expected.toordinal() - 1)
-        else:
-            break
-
-    return streak
+@router.get("/forecast", response_model=ReviewForecast)
+async def get_forecast(
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    """Expected reviews per day (UTC) if every due card is answered correctly."""
+    today = datetime.now(timezone.utc).date()
+    progress = await load_progress_arrays(db, user_id)
+    counts = await asyncio.to_thread(forecast_due_counts, progress, today, days)
+
+    return ReviewForecast(
+        days=[
+            ForecastDay(date=today + timedelta(days=i), due_count=int(count))
+            for i, count in enumerate(counts)
+        ]
+    )
@@ -1,9 +1,12 @@
+import uuid
 from datetime import date, datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import and_, select, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.models.question import Question
 from app.models.progress import UserProgress, DailyStats
@@ -11,19 +14,37 @@ from app.schemas.quiz import (
     QuizSession,
     AnswerSubmit,
     AnswerResult,
+    AnswerBatchItem,
     SessionComplete,
     SessionSummary,
 )
 from app.schemas.question import QuestionResponse, ChoiceResponse
 from app.services.session_builder import build_session
-from app.services.spaced_repetition import update_progress
+from app.services.spaced_repetition import (
+    ReviewState,
+    initial_review_state,
+    next_review_state,
+    update_progress,
+)
+from app.services.mastery import is_mastered, apply_mastery_change, apply_mastery_deltas
+from app.services.review_log import review_log
+from app.services.due_index import due_index
+from app.services.snapshot import overview_snapshot
+from app.services.streak import current_streak, record_active_day
+from app.users import get_user_id
 
 router = APIRouter(prefix="/api/quiz", tags=["quiz"])
 
 
+def _own_progress(user_id: str):
+    return and_(UserProgress.question_id == Question.id, UserProgress.user_id == user_id)
+
+
 @router.get("/session", response_model=QuizSession)
-async def get_session(db: AsyncSession = Depends(get_db)):
-    questions, review_count, new_count = await build_session(db)
+async def get_session(
+    db: AsyncSession = Depends(get_db), user_id: str = Depends(get_user_id)
+):
+    questions, review_count, new_count = await build_session(db, user_id)
 
     question_responses = [
         QuestionResponse(
@@ -46,44 +67,207 @@ async def get_session(db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/answer", response_model=AnswerResult)
-async def submit_answer(body: AnswerSubmit, db: AsyncSession = Depends(get_db)):
-    stmt = select(Question).where(Question.id == body.question_id)
-    result = await db.execute(stmt)
-    question = result.scalar_one_or_none()
+async def submit_answer(
+    body: AnswerSubmit,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    # One joined read for the answer key and the learner's SM-2 state ...
+    stmt = (
+        select(
+            Question.correct_choice_id,
+            Question.explanation,
+            Question.video_id,
+            UserProgress.id.label("progress_id"),
+            *(getattr(UserProgress, field) for field in ReviewState._fields),
+        )
+        .outerjoin(UserProgress, _own_progress(user_id))
+        .where(Question.id == body.question_id)
+    )
+    row = (await db.execute(stmt)).one_or_none()
 
-    if not question:
+    if not row:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    progress_stmt = select(UserProgress).where(
-        UserProgress.question_id == body.question_id
-    )
-    progress_result = await db.execute(progress_stmt)
-    progress = progress_result.scalar_one_or_none()
-
-    if not progress:
-        raise HTTPException(status_code=404, detail="Progress record not found")
+    is_correct = body.chosen_choice_id == row.correct_choice_id
+    now = datetime.now(timezone.utc)
+    if row.progress_id is None:
+        previous = initial_review_state(now)
+    else:
+        previous = ReviewState(*(getattr(row, field) for field in ReviewState._fields))
+    state = next_review_state(previous, is_correct, now)
 
-    is_correct = body.chosen_choice_id == question.correct_choice_id
-    update_progress(progress, is_correct)
+    # ... and a single INSERT (first answer) or UPDATE for the write.
+    if row.progress_id is None:
+        await db.execute(
+            insert(UserProgress).values(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                question_id=body.question_id,
+                **state._asdict(),
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    else:
+        await db.execute(
+            update(UserProgress)
+            .where(UserProgress.id == row.progress_id)
+            .values(**state._asdict(), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
 
-    await db.commit()
-    await db.refresh(progress)
+    await apply_mastery_change(
+        db,
+        user_id,
+        row.video_id,
+        is_mastered(previous.repetitions),
+        is_mastered(state.repetitions),
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another request created this learner's progress row first.
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Answer conflicted with another answer")
+    overview_snapshot.invalidate(user_id)
+    due_index.record_review(user_id, body.question_id, state.next_review_at, state.ease_factor)
+    review_log.record(
+        user_id=user_id,
+        question_id=body.question_id,
+        reviewed_at=now,
+        is_correct=is_correct,
+        prev_interval_days=previous.interval_days,
+        new_interval_days=state.interval_days,
+        prev_ease_factor=previous.ease_factor,
+        new_ease_factor=state.ease_factor,
+    )
 
     return AnswerResult(
         is_correct=is_correct,
-        correct_choice_id=question.correct_choice_id,
-        explanation=question.explanation,
-        streak=progress.streak,
-        ease_factor=progress.ease_factor,
-        next_review_at=progress.next_review_at.isoformat(),
+        correct_choice_id=row.correct_choice_id,
+        explanation=row.explanation,
+        streak=state.streak,
+        ease_factor=state.ease_factor,
+        next_review_at=state.next_review_at.isoformat(),
     )
 
 
+@router.post("/answers", response_model=list[AnswerBatchItem])
+async def submit_answers(
+    body: list[AnswerSubmit],
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    """Apply a batch of answers (e.g. synced by an offline client) in one transaction.
+
+    Answers are applied in `answered_at` order so repeated answers to the same
+    question replay correctly; results come back in request order.
+    """
+    if len(body) > settings.max_answer_batch_size:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.max_answer_batch_size} answers per batch",
+        )
+
+    question_ids = {a.question_id for a in body}
+    stmt = (
+        select(Question, UserProgress)
+        .outerjoin(UserProgress, _own_progress(user_id))
+        .where(Question.id.in_(question_ids))
+    )
+    now = datetime.now(timezone.utc)
+    rows = {}
+    for question, progress in (await db.execute(stmt)).all():
+        if progress is None:
+            # First answer from this learner.
+            progress = UserProgress(
+                user_id=user_id, question_id=question.id, **initial_review_state(now)._asdict()
+            )
+            db.add(progress)
+        rows[question.id] = (question, progress)
+
+    def answered_at(answer: AnswerSubmit) -> datetime:
+        if answer.answered_at is None:
+            return now
+        ts = answer.answered_at
+        # Naive timestamps are taken as UTC; aware ones are converted, since
+        # the SQLite bind drops the offset.
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        else:
+            ts = ts.astimezone(timezone.utc)
+        return min(ts, now)
+
+    order = sorted(range(len(body)), key=lambda i: answered_at(body[i]))
+    items: list[AnswerBatchItem | None] = [None] * len(body)
+    mastery_deltas: dict[str, int] = {}
+    events: list[dict] = []
+
+    for i in order:
+        answer = body[i]
+        if answer.question_id not in rows:
+            items[i] = AnswerBatchItem(question_id=answer.question_id, error="Question not found")
+            continue
+
+        question, progress = rows[answer.question_id]
+        is_correct = answer.chosen_choice_id == question.correct_choice_id
+        was_mastered = is_mastered(progress.repetitions)
+        prev_interval, prev_ease = progress.interval_days, progress.ease_factor
+        update_progress(progress, is_correct, answered_at(answer))
+        events.append(
+            dict(
+                user_id=user_id,
+                question_id=question.id,
+                reviewed_at=progress.last_reviewed_at,
+                is_correct=is_correct,
+                prev_interval_days=prev_interval,
+                new_interval_days=progress.interval_days,
+                prev_ease_factor=prev_ease,
+                new_ease_factor=progress.ease_factor,
+            )
+        )
+        delta = is_mastered(progress.repetitions) - was_mastered
+        mastery_deltas[question.video_id] = mastery_deltas.get(question.video_id, 0) + delta
+
+        items[i] = AnswerBatchItem(
+            question_id=answer.question_id,
+            result=AnswerResult(
+                is_correct=is_correct,
+                correct_choice_id=question.correct_choice_id,
+                explanation=question.explanation,
+                streak=progress.streak,
+                ease_factor=progress.ease_factor,
+                next_review_at=progress.next_review_at.isoformat(),
+            ),
+        )
+
+    await apply_mastery_deltas(db, user_id, mastery_deltas)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Answers conflicted with another answer")
+    overview_snapshot.invalidate(user_id)
+    for question, progress in rows.values():
+        due_index.record_review(
+            user_id, question.id, progress.next_review_at, progress.ease_factor
+        )
+    for event in events:
+        review_log.record(**event)
+
+    return items
+
+
 @router.post("/session/complete", response_model=SessionSummary)
-async def complete_session(body: SessionComplete, db: AsyncSession = Depends(get_db)):
+async def complete_session(
+    body: SessionComplete,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
     today = date.today()
 
-    stmt = select(DailyStats).where(DailyStats.date == today)
+    stmt = select(DailyStats).where(DailyStats.user_id == user_id, DailyStats.date == today)
     result = await db.execute(stmt)
     stats = result.scalar_one_or_none()
 
@@ -93,6 +277,7 @@ async def complete_session(body: SessionComplete, db: AsyncSession = Depends(get
         stats.session_count += 1
     else:
         stats = DailyStats(
+            user_id=user_id,
             date=today,
             questions_answered=body.questions_answered,
             questions_correct=body.questions_correct,
@@ -100,10 +285,11 @@ async def complete_session(body: SessionComplete, db: AsyncSession = Depends(get
         )
         db.add(stats)
 
+    state = await record_active_day(db, user_id, today)
     await db.commit()
+    overview_snapshot.invalidate(user_id)
 
-    # Compute current streak
-    streak = await _compute_streak(db)
+    streak = current_streak(state, today)
 
     accuracy = (
         body.questions_correct / body.questions_answered * 100
@@ -118,19 +304,3 @@ async def complete_session(body: SessionComplete, db: AsyncSession = Depends(get
         streak=streak,
     )
 
-
-async def _compute_streak(db: AsyncSession) -> int:
-    stmt = select(DailyStats).order_by(DailyStats.date.desc())
-    result = await db.execute(stmt)
-    all_stats = result.scalars().all()
-
-    streak = 0
-    expected = date.today()
-    for s in all_stats:
-        if s.date == expected:
-            streak += 1
-            expected = date.fromordinal(expected.toordinal() - 1)
-        else:
-            break
-
-    return streak
@@ -1,35 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, select, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.database import get_db
+from app.config import settings
 from app.models.video import Video
 from app.models.question import Question
-from app.models.progress import UserProgress
-from app.schemas.video import VideoCreate, VideoResponse, VideoDetail
-from app.schemas.question import QuestionResponse, ChoiceResponse
+from app.models.question_signature import QuestionLshBucket, QuestionSignature
+from app.models.progress import UserProgress, UserVideoMastery
+from app.models.transcript import VideoTranscript
+from app.models.review_event import ReviewEvent
+from app.models.job import IngestJob
+from app.schemas.video import VideoCreate, VideoResponse, VideoDetail, VideoPage
+from app.schemas.question import QuestionResponse, ChoiceResponse, QuestionPage
+from app.schemas.job import IngestJobResponse
 from app.services.transcript import TranscriptService
-from app.services.quiz_generator import QuizGenerator
-from app.ai.factory import get_ai_provider
-from app.config import settings
+from app.services.ingest import ingest_pool, ACTIVE_JOB_STATUSES
+from app.services.mastery import mastery_percentage
+from app.services.pagination import after_cursor, encode_cursor
+from app.services.snapshot import overview_snapshot
+from app.services.due_index import due_index
+from app.users import get_user_id
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
-transcript_service = TranscriptService()
-
-
-def _compute_mastery(questions: list) -> float:
-    if not questions:
-        return 0.0
-    mastered = sum(
-        1
-        for q in questions
-        if q.progress and q.progress.repetitions >= 3
-    )
-    return round(mastered / len(questions) * 100, 1)
 
 
-@router.post("", response_model=VideoResponse)
+@router.post("", response_model=IngestJobResponse, status_code=202)
 async def add_video(body: VideoCreate, db: AsyncSession = Depends(get_db)):
     try:
         video_id = TranscriptService.extract_video_id(body.url)
@@ -40,123 +36,218 @@ async def add_video(body: VideoCreate, db: AsyncSession = Depends(get_db)):
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=409, detail="Video already added")
 
-    try:
-        transcript_data = transcript_service.fetch_transcript(video_id)
-    except Exception as e:
-        raise HTTPException(
-            status_code=422,
-            detail=f"Could not fetch transcript: {str(e)}",
-        )
-
-    video = Video(
-        youtube_id=video_id,
-        url=body.url,
-        title=f"Video {video_id}",
-        thumbnail_url=f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
-        transcript_text=transcript_data["full_text"],
-        transcript_segments=transcript_data["segments"],
+    pending = await db.execute(
+        select(IngestJob)
+        .where(IngestJob.youtube_id == video_id)
+        .where(IngestJob.status.in_(ACTIVE_JOB_STATUSES))
     )
-    db.add(video)
-    await db.flush()
+    if pending.scalars().first():
+        raise HTTPException(status_code=409, detail="Video is already being added")
+
+    job = IngestJob(youtube_id=video_id, url=body.url)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    ingest_pool.submit(job.id)
+
+    return IngestJobResponse.model_validate(job)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    job = await db.get(IngestJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return IngestJobResponse.model_validate(job)
+
+
+# Everything a list row needs; the transcript stays out of list queries.
+VIDEO_SUMMARY_COLUMNS = (
+    Video.id,
+    Video.youtube_id,
+    Video.url,
+    Video.title,
+    Video.channel,
+    Video.thumbnail_url,
+    Video.question_count,
+    Video.created_at,
+)
+
+QUESTION_COLUMNS = (
+    Question.id,
+    Question.video_id,
+    Question.question_text,
+    Question.choices,
+    Question.difficulty,
+    Question.created_at,
+)
+
+DETAIL_INCLUDES = {"questions", "transcript"}
 
-    ai_provider = get_ai_provider(settings)
-    generator = QuizGenerator(ai_provider)
-    questions = await generator.generate_questions_for_video(
-        db, video.id, transcript_data["full_text"]
+PageSize = Query(settings.default_page_size, ge=1, le=settings.max_page_size)
+
+
+def _select_video_summaries(user_id: str):
+    """The summary columns plus the learner's mastered count for each video."""
+    return select(
+        *VIDEO_SUMMARY_COLUMNS,
+        func.coalesce(UserVideoMastery.mastered_count, 0).label("mastered_count"),
+    ).outerjoin(
+        UserVideoMastery,
+        and_(UserVideoMastery.video_id == Video.id, UserVideoMastery.user_id == user_id),
     )
-    video.question_count = len(questions)
 
-    await db.commit()
-    await db.refresh(video)
 
+def _video_response(v) -> VideoResponse:
     return VideoResponse(
-        id=video.id,
-        youtube_id=video.youtube_id,
-        url=video.url,
-        title=video.title,
-        channel=video.channel,
-        thumbnail_url=video.thumbnail_url,
-        question_count=video.question_count,
-        created_at=video.created_at,
-        mastery_percentage=0.0,
+        id=v.id,
+        youtube_id=v.youtube_id,
+        url=v.url,
+        title=v.title,
+        channel=v.channel,
+        thumbnail_url=v.thumbnail_url,
+        question_count=v.question_count,
+        created_at=v.created_at,
+        mastery_percentage=mastery_percentage(v.mastered_count, v.question_count),
     )
 
 
-@router.get("", response_model=list[VideoResponse])
-async def list_videos(db: AsyncSession = Depends(get_db)):
+async def _question_page(
+    db: AsyncSession, video_id: str, cursor: str | None, limit: int
+) -> QuestionPage:
     stmt = (
-        select(Video)
-        .options(joinedload(Video.questions).joinedload(Question.progress))
-        .order_by(Video.created_at.desc())
+        select(*QUESTION_COLUMNS)
+        .where(Question.video_id == video_id)
+        .order_by(Question.created_at.asc(), Question.id.asc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        try:
+            stmt = stmt.where(after_cursor(Question.created_at, Question.id, cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return QuestionPage(
+        items=[
+            QuestionResponse(
+                id=q.id,
+                video_id=q.video_id,
+                question_text=q.question_text,
+                choices=[ChoiceResponse(id=c["id"], text=c["text"]) for c in q.choices],
+                difficulty=q.difficulty,
+                created_at=q.created_at,
+            )
+            for q in rows
+        ],
+        next_cursor=next_cursor,
     )
-    result = await db.execute(stmt)
-    videos = result.unique().scalars().all()
-
-    return [
-        VideoResponse(
-            id=v.id,
-            youtube_id=v.youtube_id,
-            url=v.url,
-            title=v.title,
-            channel=v.channel,
-            thumbnail_url=v.thumbnail_url,
-            question_count=v.question_count,
-            created_at=v.created_at,
-            mastery_percentage=_compute_mastery(v.questions),
-        )
-        for v in videos
-    ]
 
 
-@router.get("/{video_id}", response_model=VideoDetail)
-async def get_video(video_id: str, db: AsyncSession = Depends(get_db)):
+@router.get("", response_model=VideoPage)
+async def list_videos(
+    cursor: str | None = None,
+    limit: int = PageSize,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    """Newest videos first, paged by an opaque (created_at, id) cursor."""
     stmt = (
-        select(Video)
-        .where(Video.id == video_id)
-        .options(joinedload(Video.questions).joinedload(Question.progress))
+        _select_video_summaries(user_id)
+        .order_by(Video.created_at.desc(), Video.id.desc())
+        .limit(limit + 1)
     )
-    result = await db.execute(stmt)
-    video = result.unique().scalar_one_or_none()
+    if cursor:
+        try:
+            stmt = stmt.where(after_cursor(Video.created_at, Video.id, cursor, descending=True))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return VideoPage(items=[_video_response(v) for v in rows], next_cursor=next_cursor)
+
+
+@router.get("/{video_id}", response_model=VideoDetail)
+async def get_video(
+    video_id: str,
+    include: str = Query(
+        "questions", description="Comma-separated parts to embed: questions, transcript"
+    ),
+    limit: int = PageSize,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    parts = {p.strip() for p in include.split(",") if p.strip()}
+    if parts - DETAIL_INCLUDES:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown include: {', '.join(sorted(parts - DETAIL_INCLUDES))}"
+        )
+
+    stmt = _select_video_summaries(user_id).where(Video.id == video_id)
+    video = (await db.execute(stmt)).one_or_none()
 
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    questions_resp = [
-        QuestionResponse(
-            id=q.id,
-            video_id=q.video_id,
-            question_text=q.question_text,
-            choices=[ChoiceResponse(id=c["id"], text=c["text"]) for c in q.choices],
-            difficulty=q.difficulty,
-            created_at=q.created_at,
-        )
-        for q in video.questions
-    ]
-
-    return VideoDetail(
-        id=video.id,
-        youtube_id=video.youtube_id,
-        url=video.url,
-        title=video.title,
-        channel=video.channel,
-        thumbnail_url=video.thumbnail_url,
-        question_count=video.question_count,
-        created_at=video.created_at,
-        mastery_percentage=_compute_mastery(video.questions),
-        transcript_text=video.transcript_text,
-        questions=questions_resp,
-    )
+    detail = VideoDetail(**_video_response(video).model_dump())
+    if "transcript" in parts:
+        transcript = await db.get(VideoTranscript, video_id)
+        detail.transcript_text = transcript.full_text if transcript else ""
+    if "questions" in parts:
+        page = await _question_page(db, video_id, None, limit)
+        detail.questions = page.items
+        detail.questions_next_cursor = page.next_cursor
+
+    return detail
+
+
+@router.get("/{video_id}/questions", response_model=QuestionPage)
+async def list_video_questions(
+    video_id: str,
+    cursor: str | None = None,
+    limit: int = PageSize,
+    db: AsyncSession = Depends(get_db),
+):
+    """A video's questions in creation order, paged by an opaque cursor."""
+    if not await db.scalar(select(Video.id).where(Video.id == video_id)):
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    return await _question_page(db, video_id, cursor, limit)
 
 
 @router.delete("/{video_id}")
 async def delete_video(video_id: str, db: AsyncSession = Depends(get_db)):
-    stmt = select(Video).where(Video.id == video_id)
-    result = await db.execute(stmt)
-    video = result.scalar_one_or_none()
-
-    if not video:
+    if not await db.scalar(select(Video.id).where(Video.id == video_id)):
         raise HTTPException(status_code=404, detail="Video not found")
 
-    await db.delete(video)
+    # Set-based deletes, children first, so nothing has to be loaded into the
+    # session and the result doesn't depend on SQLite enforcing foreign keys.
+    question_ids = select(Question.id).where(Question.video_id == video_id)
+    for stmt in (
+        delete(ReviewEvent).where(ReviewEvent.question_id.in_(question_ids)),
+        delete(UserProgress).where(UserProgress.question_id.in_(question_ids)),
+        delete(QuestionLshBucket).where(QuestionLshBucket.question_id.in_(question_ids)),
+        delete(QuestionSignature).where(QuestionSignature.question_id.in_(question_ids)),
+        delete(UserVideoMastery).where(UserVideoMastery.video_id == video_id),
+        delete(Question).where(Question.video_id == video_id),
+        delete(VideoTranscript).where(VideoTranscript.video_id == video_id),
+        delete(Video).where(Video.id == video_id),
+    ):
+        await db.execute(stmt.execution_options(synchronize_session=False))
     await db.commit()
+    overview_snapshot.invalidate()
+    due_index.remove_video(video_id)
     return {"ok": True}
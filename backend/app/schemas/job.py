@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class IngestJobResponse(BaseModel):
+    id: str
+    youtube_id: str
+    url: str
+    status: str
+    video_id: str | None
+    chunks_total: int
+    chunks_done: int
+    question_count: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
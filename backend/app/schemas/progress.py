@@ -33,3 +33,12 @@ class StreakResponse(BaseModel):
     current_streak: int
     longest_streak: int
     calendar: list[DailyStatsResponse]
+
+
+class ForecastDay(BaseModel):
+    date: date
+    due_count: int
+
+
+class ReviewForecast(BaseModel):
+    days: list[ForecastDay]
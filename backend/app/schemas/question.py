@@ -19,6 +19,11 @@ class QuestionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class QuestionPage(BaseModel):
+    items: list[QuestionResponse]
+    next_cursor: str | None = None
+
+
 class QuestionWithAnswer(QuestionResponse):
     correct_choice_id: str
     explanation: str
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 from app.schemas.question import QuestionResponse
@@ -13,6 +15,8 @@ class QuizSession(BaseModel):
 class AnswerSubmit(BaseModel):
     question_id: str
     chosen_choice_id: str
+    # When the answer was given on the client; defaults to arrival time.
+    answered_at: datetime | None = None
 
 
 class AnswerResult(BaseModel):
@@ -24,6 +28,12 @@ class AnswerResult(BaseModel):
     next_review_at: str
 
 
+class AnswerBatchItem(BaseModel):
+    question_id: str
+    result: AnswerResult | None = None
+    error: str | None = None
+
+
 class SessionComplete(BaseModel):
     questions_answered: int
     questions_correct: int
@@ -21,9 +21,16 @@ class VideoResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class VideoPage(BaseModel):
+    items: list[VideoResponse]
+    next_cursor: str | None = None
+
+
 class VideoDetail(VideoResponse):
-    transcript_text: str
+    # Only populated for the parts requested with ?include=
+    transcript_text: str | None = None
     questions: list["QuestionResponse"] = []
+    questions_next_cursor: str | None = None
 
 
 from app.schemas.question import QuestionResponse  # noqa: E402
@@ -0,0 +1,218 @@
+import asyncio
+from datetime import date, datetime, timezone
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import Float, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.config import settings
+from app.models.progress import UserProgress
+
+# Timestamps are carried as float days since the Unix epoch (UTC), NaN for
+# "never", so SM-2 arithmetic stays plain float math.
+US_PER_DAY = 86_400 * 1_000_000
+
+# Rows per UPDATE executemany in `reschedule_all`, so other requests get the
+# event loop between batches.
+WRITE_BATCH = 10_000
+
+
+class epoch_days(FunctionElement):
+    """A timestamp column as float days since the Unix epoch, computed by the database.
+
+    Loading floats skips building a datetime per row, which dominates the
+    load time for large tables. SQLite's julianday keeps milliseconds.
+    """
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(epoch_days, "sqlite")
+def _epoch_days_sqlite(element, compiler, **kw):
+    return f"(julianday({compiler.process(element.clauses, **kw)}) - 2440587.5)"
+
+
+@compiles(epoch_days, "postgresql")
+def _epoch_days_postgresql(element, compiler, **kw):
+    return (
+        f"(CAST(EXTRACT(EPOCH FROM {compiler.process(element.clauses, **kw)})"
+        " AS DOUBLE PRECISION) / 86400)"
+    )
+
+
+class ProgressArrays(NamedTuple):
+    """The SM-2 columns of every UserProgress row, one array per column."""
+
+    ids: list[str]
+    repetitions: np.ndarray
+    ease_factor: np.ndarray
+    interval_days: np.ndarray
+    last_reviewed_at: np.ndarray
+    next_review_at: np.ndarray
+
+
+def to_days(values: list[datetime | None]) -> np.ndarray:
+    """Datetimes (naive UTC or aware) to float days since the epoch, NaN for None."""
+    values = [
+        v.astimezone(timezone.utc).replace(tzinfo=None) if v is not None and v.tzinfo else v
+        for v in values
+    ]
+    stamps = np.array(values, dtype="datetime64[us]")
+    days = stamps.astype(np.int64) / US_PER_DAY
+    days[np.isnat(stamps)] = np.nan
+    return days
+
+
+def from_days(days: np.ndarray) -> list[datetime]:
+    """Inverse of `to_days` for finite values; returns naive UTC datetimes."""
+    return np.round(days * US_PER_DAY).astype(np.int64).astype("datetime64[us]").tolist()
+
+
+def _to_arrays(rows: list) -> ProgressArrays:
+    ids = [row[0] for row in rows]
+    # None (never reviewed) becomes NaN.
+    columns = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), 5)
+    return ProgressArrays(
+        ids=ids,
+        repetitions=columns[:, 0].astype(np.int64),
+        ease_factor=columns[:, 1].copy(),
+        interval_days=columns[:, 2].copy(),
+        last_reviewed_at=columns[:, 3].copy(),
+        next_review_at=columns[:, 4].copy(),
+    )
+
+
+async def load_progress_arrays(db: AsyncSession, user_id: str | None = None) -> ProgressArrays:
+    """Load one learner's progress rows, or every learner's when `user_id` is None."""
+    stmt = select(
+        UserProgress.id,
+        UserProgress.repetitions,
+        UserProgress.ease_factor,
+        UserProgress.interval_days,
+        epoch_days(UserProgress.last_reviewed_at),
+        epoch_days(UserProgress.next_review_at),
+    )
+    if user_id is not None:
+        stmt = stmt.where(UserProgress.user_id == user_id)
+    rows = (await db.execute(stmt)).tuples().all()
+    return await asyncio.to_thread(_to_arrays, rows)
+
+
+def next_review_states(
+    repetitions: np.ndarray,
+    ease_factor: np.ndarray,
+    interval_days: np.ndarray,
+    is_correct: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized `next_review_state` for (repetitions, ease_factor, interval_days)."""
+    interval_days = np.where(
+        is_correct,
+        np.select(
+            [repetitions == 0, repetitions == 1],
+            [settings.sm2_first_interval, settings.sm2_second_interval],
+            default=interval_days * ease_factor,
+        ),
+        settings.sm2_incorrect_interval,
+    )
+    repetitions = np.where(is_correct, repetitions + 1, 0)
+
+    quality = np.where(is_correct, 4, 1)
+    ease_factor = np.maximum(
+        settings.sm2_min_ease_factor,
+        ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)),
+    )
+    return repetitions, ease_factor, interval_days
+
+
+def scheduled_intervals(repetitions: np.ndarray, ease_factor: np.ndarray) -> np.ndarray:
+    """Vectorized `scheduled_interval`, equal to it up to float rounding.
+
+    NumPy's pow can differ from Python's by an ulp, so compare the two with
+    a tolerance (as `reschedule` and scripts.bench_batch_scheduler do).
+    """
+    return np.select(
+        [repetitions == 0, repetitions == 1],
+        [settings.sm2_incorrect_interval, settings.sm2_first_interval],
+        default=settings.sm2_second_interval
+        * ease_factor ** np.maximum(repetitions - 2, 0),
+    )
+
+
+def forecast_due_counts(progress: ProgressArrays, today: date, days: int) -> np.ndarray:
+    """Number of reviews due on each of the next `days` days (UTC).
+
+    Overdue cards count towards today. Every review is assumed to be done on
+    its due day and answered correctly, so cards come back within the window
+    on their next interval. Unseen cards are not reviews and are left out.
+    """
+    seen = ~np.isnan(progress.last_reviewed_at)
+    repetitions = progress.repetitions[seen]
+    ease = progress.ease_factor[seen]
+    interval = progress.interval_days[seen]
+    due_at = progress.next_review_at[seen]
+
+    start = np.datetime64(today, "D").astype(np.int64)
+    counts = np.zeros(days, dtype=np.int64)
+    for day in range(days):
+        due = np.flatnonzero(due_at < start + day + 1)
+        counts[day] = due.size
+        if not due.size:
+            continue
+        repetitions[due], ease[due], interval[due] = next_review_states(
+            repetitions[due], ease[due], interval[due], np.ones(due.size, dtype=bool)
+        )
+        due_at[due] = np.maximum(due_at[due], start + day) + interval[due]
+    return counts
+
+
+def reschedule(progress: ProgressArrays) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Recompute (changed row mask, ease, interval) for reviewed cards from current settings."""
+    seen = ~np.isnan(progress.last_reviewed_at)
+    ease = np.maximum(settings.sm2_min_ease_factor, progress.ease_factor)
+    interval = np.where(
+        seen, scheduled_intervals(progress.repetitions, ease), progress.interval_days
+    )
+    changed = seen & (
+        (ease != progress.ease_factor) | ~np.isclose(interval, progress.interval_days)
+    )
+    return changed, ease, interval
+
+
+def _reschedule_params(progress: ProgressArrays) -> list[dict]:
+    changed, ease, interval = reschedule(progress)
+    rows = np.flatnonzero(changed)
+    next_review = from_days(progress.last_reviewed_at[rows] + interval[rows])
+    return [
+        {
+            "row_id": progress.ids[i],
+            "ease_factor": e,
+            "interval_days": d,
+            "next_review_at": due,
+        }
+        for i, e, d, due in zip(
+            rows.tolist(), ease[rows].tolist(), interval[rows].tolist(), next_review
+        )
+    ]
+
+
+async def reschedule_all(db: AsyncSession) -> int:
+    """Apply `reschedule` to every learner's progress rows and persist the ones that changed.
+
+    The array work runs in a thread and the UPDATE goes out in batches of
+    WRITE_BATCH rows, so a large table doesn't hold up other requests.
+    """
+    progress = await load_progress_arrays(db)
+    params = await asyncio.to_thread(_reschedule_params, progress)
+    if not params:
+        return 0
+
+    table = UserProgress.__table__
+    stmt = update(table).where(table.c.id == bindparam("row_id"))
+    for start in range(0, len(params), WRITE_BATCH):
+        await db.execute(stmt, params[start : start + WRITE_BATCH])
+    await db.commit()
+    return len(params)
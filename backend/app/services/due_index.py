@@ -0,0 +1,263 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.progress import UserProgress
+from app.models.question import Question
+from app.models.video import Video
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes (stored as UTC); writes use aware ones.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _push(heap: list, current: dict, question_id: str, key) -> None:
+    if current.get(question_id) == key:
+        return
+    current[question_id] = key
+    heapq.heappush(heap, (key, question_id))
+    # Stale entries are only dropped when they reach the top; compact once
+    # they make up most of the heap.
+    if len(heap) > 2 * len(current) + 1024:
+        heap[:] = [(k, q) for q, k in current.items()]
+        heapq.heapify(heap)
+
+
+def _take(heap: list, current: dict, limit: int, until=None) -> list[str]:
+    """Pop up to `limit` live entries (with key <= `until`), then push them back."""
+    taken = []
+    while heap and len(taken) < limit:
+        key, question_id = heap[0]
+        if current.get(question_id) != key or (taken and taken[-1] == heap[0]):
+            heapq.heappop(heap)
+            continue
+        if until is not None and key > until:
+            break
+        taken.append(heapq.heappop(heap))
+    for entry in taken:
+        heapq.heappush(heap, entry)
+    return [question_id for _, question_id in taken]
+
+
+class _LearnerIndex:
+    """One learner's reviewed questions, keyed by due time and by ease."""
+
+    def __init__(self, rows):
+        self.due_at: dict[str, datetime] = {}
+        self.ease: dict[str, float] = {}
+        for question_id, next_review_at, ease_factor in rows:
+            self.due_at[question_id] = _utc(next_review_at)
+            self.ease[question_id] = ease_factor
+        self.due = [(k, q) for q, k in self.due_at.items()]
+        heapq.heapify(self.due)
+        self.easiest = [(k, q) for q, k in self.ease.items()]
+        heapq.heapify(self.easiest)
+
+    def discard(self, question_id: str) -> None:
+        self.due_at.pop(question_id, None)
+        self.ease.pop(question_id, None)
+
+
+class DueIndex:
+    """In-process scheduling index for session building.
+
+    Holds a catalog of every question sorted by (video created_at,
+    segment_start), shared by all learners, and for each recently active
+    learner a heap of their reviewed questions keyed by `next_review_at`
+    and one keyed by ease factor. A learner's new questions are the catalog
+    minus what they have reviewed. Heaps use lazy deletion: an entry is live
+    only if it still matches the question's current value.
+
+    The catalog is built at startup; learners are loaded on their first
+    session and the least recently used are dropped beyond `max_learners`.
+    Answers, ingest and deletes keep both current. It is per process, like
+    the overview snapshot. Until a learner is loaded, callers fall back to
+    SQL; a write that lands while a load is in flight makes the load discard
+    itself, and the next session starts another one.
+    """
+
+    def __init__(self, max_learners: int):
+        self.max_learners = max_learners
+        self.ready = False
+        self._generation = 0
+        # Writes per learner, kept only while that learner's load is in flight.
+        self._learner_generations: dict[str, int] = {}
+        self._building: asyncio.Task | None = None
+        self._loading: dict[str, asyncio.Task] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._catalog: list[tuple[datetime, float, str]] = []
+        self._catalog_key: dict[str, tuple[datetime, float, str]] = {}
+        self._by_video: dict[str, set[str]] = {}
+        self._learners: OrderedDict[str, _LearnerIndex] = OrderedDict()
+
+    @staticmethod
+    def _catalog_sort_key(
+        question_id: str, video_created_at: datetime, segment_start: float | None
+    ) -> tuple[datetime, float, str]:
+        # Unplaced questions sort first, like NULLs in SQLite.
+        return (
+            _utc(video_created_at),
+            -math.inf if segment_start is None else segment_start,
+            question_id,
+        )
+
+    # Reads
+
+    def is_loaded(self, user_id: str) -> bool:
+        return self.ready and user_id in self._learners
+
+    def _learner(self, user_id: str) -> _LearnerIndex:
+        self._learners.move_to_end(user_id)
+        return self._learners[user_id]
+
+    def due_reviews(self, user_id: str, now: datetime, limit: int) -> list[str]:
+        learner = self._learner(user_id)
+        return _take(learner.due, learner.due_at, limit, until=_utc(now))
+
+    def new_questions(self, user_id: str, limit: int) -> list[str]:
+        # Walks past the learner's reviewed questions at the front of the
+        # catalog; cheap while the new ones are near the front.
+        reviewed = self._learner(user_id).due_at
+        picked = []
+        for _, _, question_id in self._catalog:
+            if question_id not in reviewed:
+                picked.append(question_id)
+                if len(picked) == limit:
+                    break
+        return picked
+
+    def lowest_ease(self, user_id: str, limit: int) -> list[str]:
+        learner = self._learner(user_id)
+        return _take(learner.easiest, learner.ease, limit)
+
+    # Writes
+
+    def record_review(
+        self, user_id: str, question_id: str, next_review_at: datetime, ease_factor: float
+    ) -> None:
+        if user_id in self._learner_generations:
+            self._learner_generations[user_id] += 1
+        learner = self._learners.get(user_id)
+        if learner is None:
+            return
+        _push(learner.due, learner.due_at, question_id, _utc(next_review_at))
+        _push(learner.easiest, learner.ease, question_id, ease_factor)
+
+    def remove_video(self, video_id: str) -> None:
+        self._generation += 1
+        for question_id in self._by_video.pop(video_id, ()):
+            key = self._catalog_key.pop(question_id, None)
+            if key is not None:
+                i = bisect.bisect_left(self._catalog, key)
+                if i < len(self._catalog) and self._catalog[i] == key:
+                    del self._catalog[i]
+            for learner in self._learners.values():
+                learner.discard(question_id)
+
+    def forget_learners(self) -> None:
+        """Drop every learner's heaps (e.g. after a bulk reschedule); they reload on demand."""
+        self._generation += 1
+        self._learners.clear()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self.ready = False
+        self._reset()
+
+    # Loading
+
+    @staticmethod
+    def _catalog_stmt():
+        return select(
+            Question.id, Question.video_id, Video.created_at, Question.segment_start
+        ).join(Video)
+
+    async def add_video(self, db: AsyncSession, video_id: str) -> None:
+        """Add a newly ingested video's questions to the catalog."""
+        self._generation += 1
+        if not self.ready:
+            return
+        stmt = self._catalog_stmt().where(Question.video_id == video_id)
+        rows = (await db.execute(stmt)).all()
+        if not self.ready:
+            return
+        for question_id, video_id, created_at, segment_start in rows:
+            if question_id in self._catalog_key:
+                continue
+            key = self._catalog_sort_key(question_id, created_at, segment_start)
+            self._catalog_key[question_id] = key
+            self._by_video.setdefault(video_id, set()).add(question_id)
+            bisect.insort(self._catalog, key)
+
+    async def build(self) -> None:
+        """(Re)build the question catalog; learners are loaded on demand."""
+        generation = self._generation
+        async with async_session() as db:
+            rows = (await db.execute(self._catalog_stmt())).all()
+
+        if generation != self._generation:
+            logger.info("Due index build raced with a write; will retry")
+            return
+
+        self._reset()
+        for question_id, video_id, created_at, segment_start in rows:
+            self._catalog_key[question_id] = self._catalog_sort_key(
+                question_id, created_at, segment_start
+            )
+            self._by_video.setdefault(video_id, set()).add(question_id)
+        self._catalog = sorted(self._catalog_key.values())
+        self.ready = True
+        logger.info(f"Due index built over {len(rows)} questions")
+
+    async def load_learner(self, user_id: str) -> None:
+        generation = self._generation
+        self._learner_generations[user_id] = 0
+        try:
+            async with async_session() as db:
+                rows = (
+                    await db.execute(
+                        select(
+                            UserProgress.question_id,
+                            UserProgress.next_review_at,
+                            UserProgress.ease_factor,
+                        ).where(UserProgress.user_id == user_id)
+                    )
+                ).all()
+        finally:
+            writes = self._learner_generations.pop(user_id)
+
+        if not self.ready or writes or generation != self._generation:
+            return
+
+        self._learners[user_id] = _LearnerIndex(rows)
+        while len(self._learners) > self.max_learners:
+            self._learners.popitem(last=False)
+
+    def ensure_loading(self, user_id: str) -> None:
+        """Start whatever background load `user_id`'s sessions are waiting on."""
+        if not self.ready:
+            if self._building is None or self._building.done():
+                self._building = asyncio.create_task(self.build(), name="due-index-build")
+            return
+        if user_id in self._learners or user_id in self._loading:
+            return
+        task = asyncio.create_task(self.load_learner(user_id), name="due-index-load")
+        self._loading[user_id] = task
+        task.add_done_callback(lambda _: self._loading.pop(user_id, None))
+
+
+due_index = DueIndex(max_learners=settings.due_index_max_users)
@@ -0,0 +1,144 @@
+import uuid
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.ai.factory import get_ai_provider
+from app.config import settings
+from app.database import async_session
+from app.models.job import IngestJob
+from app.models.video import Video
+from app.models.transcript import VideoTranscript
+from app.services.quiz_generator import QuizGenerator
+from app.services.due_index import due_index
+from app.services.near_duplicates import library_lock
+from app.services.snapshot import overview_snapshot
+from app.services.transcript import TranscriptService
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+transcript_service = TranscriptService()
+
+
+async def _update_job(job_id: str, **values) -> None:
+    async with async_session() as db:
+        await db.execute(update(IngestJob).where(IngestJob.id == job_id).values(**values))
+        await db.commit()
+
+
+async def run_ingest_job(job_id: str) -> None:
+    """Fetch the transcript, generate questions and persist the video for one job.
+
+    Each step uses its own short-lived session so that the job row stays
+    writable (for progress updates) while the LLM calls are in flight.
+    """
+    async with async_session() as db:
+        job = await db.get(IngestJob, job_id)
+        if job is None or job.status not in ACTIVE_JOB_STATUSES:
+            return
+        youtube_id, url = job.youtube_id, job.url
+        job.status = JOB_RUNNING
+        job.chunks_done = 0
+        job.error = None
+        await db.commit()
+
+    try:
+        transcript_data = await transcript_service.fetch_transcript_async(youtube_id)
+    except Exception as e:
+        await _update_job(job_id, status=JOB_FAILED, error=f"Could not fetch transcript: {e}")
+        return
+
+    async def on_progress(done: int, total: int) -> None:
+        await _update_job(job_id, chunks_done=done, chunks_total=total)
+
+    async with async_session() as db:
+        # The id is assigned up front so nothing has to be flushed (and no
+        # write lock taken) until the generated questions are inserted.
+        video = Video(
+            id=str(uuid.uuid4()),
+            youtube_id=youtube_id,
+            url=url,
+            title=f"Video {youtube_id}",
+            thumbnail_url=f"https://img.youtube.com/vi/{youtube_id}/mqdefault.jpg",
+            transcript=VideoTranscript.from_segments(transcript_data["segments"]),
+        )
+        db.add(video)
+
+        generator = QuizGenerator(get_ai_provider(settings))
+        placed = await generator.generate(transcript_data["segments"], on_progress=on_progress)
+
+        # Until the commit, so the next ingest's check sees these questions.
+        async with library_lock(db):
+            question_ids = await generator.save(db, video.id, placed)
+            video.question_count = len(question_ids)
+            try:
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                await _update_job(job_id, status=JOB_FAILED, error="Video already added")
+                return
+
+        await due_index.add_video(db, video.id)
+
+    overview_snapshot.invalidate()
+
+    await _update_job(
+        job_id, status=JOB_COMPLETED, video_id=video.id, question_count=len(question_ids)
+    )
+
+
+class IngestWorkerPool:
+    """In-process pool of workers draining a queue of ingest job ids."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        # Jobs interrupted by a restart are picked up again from the table.
+        async with async_session() as db:
+            result = await db.execute(
+                select(IngestJob.id)
+                .where(IngestJob.status.in_(ACTIVE_JOB_STATUSES))
+                .order_by(IngestJob.created_at.asc())
+            )
+            for job_id in result.scalars().all():
+                self.queue.put_nowait(job_id)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingest-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job_id: str) -> None:
+        self.queue.put_nowait(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await run_ingest_job(job_id)
+            except Exception as e:
+                logger.exception(f"Ingest job {job_id} failed")
+                await _update_job(job_id, status=JOB_FAILED, error=str(e))
+            finally:
+                self.queue.task_done()
+
+
+ingest_pool = IngestWorkerPool(workers=settings.ingest_workers)
@@ -0,0 +1,106 @@
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.video import Video
+from app.models.question import Question
+from app.models.progress import UserProgress, UserVideoMastery
+
+# A question counts as mastered after this many consecutive correct reviews.
+MASTERY_REPETITIONS = 3
+
+
+def is_mastered(repetitions: int) -> bool:
+    return repetitions >= MASTERY_REPETITIONS
+
+
+def mastery_percentage(mastered: int, total: int) -> float:
+    return round(mastered / total * 100, 1) if total else 0.0
+
+
+async def apply_mastery_change(
+    db: AsyncSession, user_id: str, video_id: str, was_mastered: bool, now_mastered: bool
+) -> None:
+    """Adjust the learner's mastered counter for a video in the caller's transaction."""
+    if was_mastered != now_mastered:
+        await apply_mastery_deltas(db, user_id, {video_id: 1 if now_mastered else -1})
+
+
+async def apply_mastery_deltas(db: AsyncSession, user_id: str, deltas: dict[str, int]) -> None:
+    """Apply net mastered-counter changes per video in the caller's transaction."""
+    for video_id, delta in deltas.items():
+        if not delta:
+            continue
+        result = await db.execute(
+            update(UserVideoMastery)
+            .where(
+                UserVideoMastery.user_id == user_id, UserVideoMastery.video_id == video_id
+            )
+            .values(mastered_count=UserVideoMastery.mastered_count + delta)
+        )
+        if result.rowcount == 0:
+            await db.execute(
+                insert(UserVideoMastery).values(
+                    user_id=user_id, video_id=video_id, mastered_count=max(delta, 0)
+                )
+            )
+
+
+async def repair_mastery_counters(db: AsyncSession) -> int:
+    """Recount every video's question_count and every learner's mastered counts.
+
+    Returns the number of stored counters that were wrong. The caller
+    commits.
+    """
+    totals = (
+        select(Question.video_id, func.count(Question.id).label("total"))
+        .group_by(Question.video_id)
+        .subquery()
+    )
+    stmt = select(Video.id, Video.question_count, func.coalesce(totals.c.total, 0)).outerjoin(
+        totals, totals.c.video_id == Video.id
+    )
+
+    fixed = 0
+    for video_id, question_count, total in (await db.execute(stmt)).all():
+        if question_count != total:
+            await db.execute(update(Video).where(Video.id == video_id).values(question_count=total))
+            fixed += 1
+
+    actual = {
+        (user_id, video_id): mastered
+        for user_id, video_id, mastered in (
+            await db.execute(
+                select(UserProgress.user_id, Question.video_id, func.count(UserProgress.id))
+                .join(Question)
+                .where(UserProgress.repetitions >= MASTERY_REPETITIONS)
+                .group_by(UserProgress.user_id, Question.video_id)
+            )
+        ).all()
+    }
+    stored = {
+        (user_id, video_id): mastered
+        for user_id, video_id, mastered in (
+            await db.execute(
+                select(
+                    UserVideoMastery.user_id,
+                    UserVideoMastery.video_id,
+                    UserVideoMastery.mastered_count,
+                )
+            )
+        ).all()
+        if mastered
+    }
+    if actual != stored:
+        fixed += sum(
+            1 for key in actual.keys() | stored.keys() if actual.get(key) != stored.get(key)
+        )
+        await db.execute(delete(UserVideoMastery))
+        if actual:
+            await db.execute(
+                insert(UserVideoMastery),
+                [
+                    {"user_id": user_id, "video_id": video_id, "mastered_count": mastered}
+                    for (user_id, video_id), mastered in actual.items()
+                ],
+            )
+    return fixed
@@ -0,0 +1,180 @@
+import re
+import zlib
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+
+import numpy as np
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.question_signature import QuestionLshBucket, QuestionSignature
+
+logger = logging.getLogger(__name__)
+
+# Stored signatures and buckets depend on all of these and on matching_text;
+# changing any of them means re-running scripts.index_question_signatures --rebuild.
+SHINGLE_CHARS = 5
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Largest prime below 2**32, so a * x + b fits in a uint64 for 32-bit a, b, x.
+_PRIME = np.uint64(4_294_967_291)
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+
+_SIGNATURE_DTYPE = np.dtype("<u4")
+
+# Arbitrary key for the advisory lock that serializes library updates
+# across API replicas.
+LIBRARY_LOCK_ID = 0x6C7475626532
+_library_lock = asyncio.Lock()
+
+
+def matching_text(question_text: str, answer_text: str) -> str:
+    """What a question is fingerprinted by: its stem and its correct answer.
+
+    Stems alone are too alike across questions built from one template
+    ("What is the capital of France?" / "...of Germany?"); the answer
+    tells those apart while rephrasings of one question still match.
+    """
+    return f"{question_text} {answer_text}"
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def shingles(text: str) -> set[str]:
+    """Overlapping SHINGLE_CHARS-character windows of the normalized text."""
+    text = normalize(text)
+    if len(text) <= SHINGLE_CHARS:
+        return {text}
+    return {text[i : i + SHINGLE_CHARS] for i in range(len(text) - SHINGLE_CHARS + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature: per permutation, the smallest hash over the text's shingles."""
+    # crc32 rather than hash() so signatures are stable across processes.
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64
+    )[None, :]
+    return ((_A * hashes + _B) % _PRIME).min(axis=1).astype(_SIGNATURE_DTYPE)
+
+
+def buckets(sig: np.ndarray) -> list[int]:
+    """Hash each band of the signature (with its band number) to a signed 64-bit bucket."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest(),
+            "big",
+            signed=True,
+        )
+        for band, rows in enumerate(sig.astype(_SIGNATURE_DTYPE).reshape(BANDS, ROWS_PER_BAND))
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERMUTATIONS
+
+
+@asynccontextmanager
+async def library_lock(db: AsyncSession):
+    """Hold while checking, saving and committing one ingest's questions.
+
+    Each check only sees committed signatures, so two ingests checking at
+    once would both keep their near-duplicates of each other. The asyncio
+    lock orders this process's workers; on PostgreSQL a transaction-level
+    advisory lock orders other replicas too, until `db` commits or rolls back.
+    """
+    async with _library_lock:
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": LIBRARY_LOCK_ID})
+        yield
+
+
+async def drop_near_duplicates(
+    db: AsyncSession, texts: list[str], threshold: float | None = None
+) -> tuple[list[int], list[np.ndarray]]:
+    """Drop question texts that nearly repeat one in the library or earlier in `texts`.
+
+    Candidates are questions sharing an LSH bucket; a candidate counts as a
+    duplicate when its estimated similarity reaches `threshold`. Returns the
+    indices of the kept texts and their signatures, for `save_signatures`.
+    """
+    threshold = settings.near_duplicate_threshold if threshold is None else threshold
+    signatures = [signature(text) for text in texts]
+    question_buckets = [buckets(sig) for sig in signatures]
+
+    library: dict[int, list[str]] = {}
+    wanted = list({b for bs in question_buckets for b in bs})
+    # Batched to stay under SQLite's bound-parameter limit.
+    for start in range(0, len(wanted), 1000):
+        rows = await db.execute(
+            select(QuestionLshBucket.bucket, QuestionLshBucket.question_id).where(
+                QuestionLshBucket.bucket.in_(wanted[start : start + 1000])
+            )
+        )
+        for bucket, question_id in rows:
+            library.setdefault(bucket, []).append(question_id)
+
+    candidate_ids = list({q for ids in library.values() for q in ids})
+    library_signatures: dict[str, np.ndarray] = {}
+    for start in range(0, len(candidate_ids), 1000):
+        rows = await db.execute(
+            select(QuestionSignature.question_id, QuestionSignature.signature).where(
+                QuestionSignature.question_id.in_(candidate_ids[start : start + 1000])
+            )
+        )
+        for question_id, blob in rows:
+            library_signatures[question_id] = np.frombuffer(blob, dtype=_SIGNATURE_DTYPE)
+
+    kept: list[int] = []
+    kept_signatures: list[np.ndarray] = []
+    batch: dict[int, list[int]] = {}
+    for i, (sig, bs) in enumerate(zip(signatures, question_buckets)):
+        matches = {q for b in bs for q in library.get(b, ())}
+        earlier = {k for b in bs for k in batch.get(b, ())}
+        closest = max(
+            [similarity(sig, library_signatures[q]) for q in matches if q in library_signatures]
+            + [similarity(sig, kept_signatures[k]) for k in earlier],
+            default=0.0,
+        )
+        if closest >= threshold:
+            logger.info(f"Dropping near-duplicate ({closest:.2f}): {texts[i]!r}")
+            continue
+        for b in bs:
+            batch.setdefault(b, []).append(len(kept))
+        kept.append(i)
+        kept_signatures.append(sig)
+
+    if len(kept) < len(texts):
+        logger.info(f"Dropped {len(texts) - len(kept)} near-duplicate question(s)")
+    return kept, kept_signatures
+
+
+async def save_signatures(
+    db: AsyncSession, question_ids: list[str], signatures: list[np.ndarray]
+) -> None:
+    """Index newly inserted questions so later ones are checked against them."""
+    if not question_ids:
+        return
+    await db.execute(
+        insert(QuestionSignature),
+        [
+            {"question_id": question_id, "signature": sig.astype(_SIGNATURE_DTYPE).tobytes()}
+            for question_id, sig in zip(question_ids, signatures)
+        ],
+    )
+    # A set: two bands of one signature could in principle share a bucket.
+    rows = [
+        {"bucket": bucket, "question_id": question_id}
+        for question_id, sig in zip(question_ids, signatures)
+        for bucket in set(buckets(sig))
+    ]
+    await db.execute(insert(QuestionLshBucket), rows)
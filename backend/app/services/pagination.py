@@ -0,0 +1,33 @@
+import json
+import base64
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def after_cursor(
+    created_at_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    cursor: str,
+    descending: bool = False,
+):
+    """WHERE clause selecting the rows that follow `cursor` in (created_at, id) order."""
+    created_at, row_id = decode_cursor(cursor)
+    key = tuple_(created_at_col, id_col)
+    return key < (created_at, row_id) if descending else key > (created_at, row_id)
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.base import GeneratedQuestion
+from app.models.question import Question
+
+
+async def bulk_insert_questions(
+    db: AsyncSession,
+    video_id: str,
+    generated: list[GeneratedQuestion],
+    segments: list[tuple[float, float]] | None = None,
+) -> list[str]:
+    """Insert questions with one executemany.
+
+    `segments` optionally gives each question's (start, end) time in the
+    video. Bypasses the unit of work, so nothing is added to the session's
+    identity map. Progress rows are created per learner on their first
+    answer, not here. Returns the new question ids in the order of
+    `generated`.
+    """
+    if not generated:
+        return []
+
+    now = datetime.now(timezone.utc)
+    question_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "video_id": video_id,
+            "question_text": gq.question_text,
+            "choices": [c.model_dump() for c in gq.choices],
+            "correct_choice_id": gq.correct_choice_id,
+            "explanation": gq.explanation,
+            "difficulty": gq.difficulty,
+            "segment_start": segment[0] if segment else None,
+            "segment_end": segment[1] if segment else None,
+            "created_at": now,
+        }
+        for gq, segment in zip(generated, segments or [None] * len(generated))
+    ]
+
+    result = await db.execute(
+        insert(Question).returning(Question.id, sort_by_parameter_order=True),
+        question_rows,
+    )
+    return list(result.scalars().all())
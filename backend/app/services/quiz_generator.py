@@ -1,67 +1,190 @@
-import uuid
+import asyncio
 import logging
-from datetime import datetime, timezone
+from collections.abc import Awaitable, Callable, Iterator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.ai.base import AIProvider
+from app.ai.base import AIProvider, GeneratedQuestion
+from app.ai.prompts import estimate_tokens
 from app.config import settings
-from app.models.question import Question
-from app.models.progress import UserProgress
+from app.services.near_duplicates import drop_near_duplicates, matching_text, save_signatures
+from app.services.question_store import bulk_insert_questions
 from app.services.transcript import TranscriptService
 
 logger = logging.getLogger(__name__)
 
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+# A generated question and the (start, end) time of the chunk it came from.
+PlacedQuestion = tuple[GeneratedQuestion, tuple[float, float]]
+
+
+def pack_chunks(chunks: Iterator[dict], token_budget: int, max_chunks: int) -> Iterator[list[dict]]:
+    """Group consecutive chunks into batches within `token_budget` and `max_chunks`.
+
+    A chunk larger than the budget on its own gets a batch to itself.
+    """
+    batch: list[dict] = []
+    tokens = 0
+    for chunk in chunks:
+        size = estimate_tokens(chunk["text"])
+        if batch and (tokens + size > token_budget or len(batch) == max_chunks):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(chunk)
+        tokens += size
+    if batch:
+        yield batch
+
 
 class QuizGenerator:
-    def __init__(self, ai_provider: AIProvider):
+    def __init__(self, ai_provider: AIProvider, concurrency: int | None = None):
         self.ai = ai_provider
         self.transcript_service = TranscriptService()
+        self.concurrency = max(1, concurrency or settings.generation_concurrency)
 
     async def generate_questions_for_video(
-        self, db: AsyncSession, video_id: str, transcript_text: str
-    ) -> list[Question]:
-        chunks = self.transcript_service.chunk_transcript(
-            transcript_text,
+        self,
+        db: AsyncSession,
+        video_id: str,
+        segments: list[dict],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[str]:
+        """Generate questions for a video and insert them. Returns the question ids.
+
+        Shorthand for `generate` then `save`; callers that ingest
+        concurrently should hold `library_lock` around `save` and the commit.
+        """
+        placed = await self.generate(segments, on_progress)
+        return await self.save(db, video_id, placed)
+
+    async def generate(
+        self, segments: list[dict], on_progress: ProgressCallback | None = None
+    ) -> list[PlacedQuestion]:
+        """Generate questions for a video's transcript, each with its time range.
+
+        Chunks are packed into multi-chunk requests when the provider
+        supports it. Each question is placed at the time range of the
+        transcript chunk it came from.
+        `on_progress(chunks_done, chunks_total)` is awaited once before the
+        first chunk and again after each chunk finishes.
+        """
+        total, chunks = self.transcript_service.chunk_transcript(
+            segments,
             chunk_size=settings.transcript_chunk_words,
             overlap=settings.transcript_chunk_overlap,
         )
 
-        all_questions: list[Question] = []
-        existing_texts: list[str] = []
+        if on_progress:
+            await on_progress(0, total)
 
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i + 1}/{len(chunks)}")
-            try:
-                generated = await self.ai.generate_questions(
-                    transcript_chunk=chunk["text"],
-                    num_questions=settings.questions_per_chunk,
-                    existing_questions=existing_texts[-10:] if existing_texts else None,
-                )
-            except Exception as e:
-                logger.error(f"Failed to generate questions for chunk {i + 1}: {e}")
-                continue
-
-            for gq in generated:
-                question = Question(
-                    id=str(uuid.uuid4()),
-                    video_id=video_id,
-                    question_text=gq.question_text,
-                    choices=[c.model_dump() for c in gq.choices],
-                    correct_choice_id=gq.correct_choice_id,
-                    explanation=gq.explanation,
-                    difficulty=gq.difficulty,
-                )
-                db.add(question)
+        if self.ai.supports_batching:
+            # No bigger than needed to send every chunk in one round of
+            # `concurrency` requests: packing further saves requests but
+            # makes each one generate more output, which is slower overall.
+            per_request = min(settings.ai_batch_max_chunks, -(-total // self.concurrency))
+            batches = pack_chunks(chunks, settings.ai_batch_token_budget, per_request)
+        else:
+            batches = ([chunk] for chunk in chunks)
+
+        if self.concurrency > 1:
+            return await self._generate_concurrent(batches, total, on_progress)
+        return await self._generate_sequential(batches, total, on_progress)
 
-                progress = UserProgress(
-                    id=str(uuid.uuid4()),
-                    question_id=question.id,
-                    next_review_at=datetime.now(timezone.utc),
+    async def save(
+        self, db: AsyncSession, video_id: str, placed: list[PlacedQuestion]
+    ) -> list[str]:
+        """Insert generated questions for a video. Returns the question ids.
+
+        Questions that nearly repeat one already in the library, or one from
+        an earlier chunk, are dropped.
+        """
+        kept, signatures = await drop_near_duplicates(
+            db,
+            [
+                matching_text(
+                    gq.question_text,
+                    next(c.text for c in gq.choices if c.id == gq.correct_choice_id),
                 )
-                db.add(progress)
+                for gq, _ in placed
+            ],
+        )
+        question_ids = await bulk_insert_questions(
+            db,
+            video_id,
+            [placed[i][0] for i in kept],
+            segments=[placed[i][1] for i in kept],
+        )
+        await save_signatures(db, question_ids, signatures)
+        return question_ids
+
+    async def _generate_batch(
+        self, first: int, total: int, batch: list[dict]
+    ) -> list[PlacedQuestion]:
+        logger.info(f"Processing chunks {first + 1}-{first + len(batch)}/{total}")
+        try:
+            results = await self.ai.generate_questions_batch(
+                [chunk["text"] for chunk in batch],
+                num_questions=settings.questions_per_chunk,
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to generate questions for chunks {first + 1}-{first + len(batch)}: {e}"
+            )
+            results = [[] for _ in batch]
+        return [
+            (gq, (chunk["start"], chunk["end"]))
+            for chunk, questions in zip(batch, results)
+            for gq in questions
+        ]
+
+    async def _generate_sequential(
+        self, batches: Iterator[list[dict]], total: int, on_progress: ProgressCallback | None
+    ) -> list[PlacedQuestion]:
+        placed: list[PlacedQuestion] = []
+        done = 0
 
-                all_questions.append(question)
-                existing_texts.append(gq.question_text)
+        for batch in batches:
+            placed.extend(await self._generate_batch(done, total, batch))
+            done += len(batch)
+            if on_progress:
+                await on_progress(done, total)
+
+        return placed
+
+    async def _generate_concurrent(
+        self, batches: Iterator[list[dict]], total: int, on_progress: ProgressCallback | None
+    ) -> list[PlacedQuestion]:
+        """Fan batches out to the provider, at most `concurrency` requests in flight.
+
+        The next batch is only cut once a slot is free, so only the chunk
+        texts of in-flight requests are held. Results are flattened in chunk
+        order so the saved questions are deterministic regardless of which
+        request finishes first.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def run(first: int, batch: list[dict]) -> list[PlacedQuestion]:
+            nonlocal done
+            try:
+                result = await self._generate_batch(first, total, batch)
+            finally:
+                semaphore.release()
+            done += len(batch)
+            if on_progress:
+                await on_progress(done, total)
+            return result
 
-        return all_questions
+        tasks: list[asyncio.Task] = []
+        first = 0
+        try:
+            for batch in batches:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(run(first, batch)))
+                first += len(batch)
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [pq for batch_questions in results for pq in batch_questions]
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import async_session
+from app.models.question import Question
+from app.models.review_event import ReviewEvent
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewLogWriter:
+    """Write-behind queue for review events.
+
+    `record()` only enqueues, so answering never waits on the log. A single
+    background task inserts events in batches of up to `batch_size`, or
+    whatever has arrived `flush_interval_ms` after the first pending event.
+    When more than `max_pending` events are waiting, new ones are dropped
+    with a warning rather than slowing down answers.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self._batch: list[dict] = []
+        self._inflight: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="review-log-writer")
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing everything already recorded."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._inflight is not None:
+            await asyncio.gather(self._inflight, return_exceptions=True)
+
+        pending, self._batch = self._batch, []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for start in range(0, len(pending), self.batch_size):
+            await self._flush(pending[start : start + self.batch_size])
+
+    def record(
+        self,
+        user_id: str,
+        question_id: str,
+        reviewed_at: datetime,
+        is_correct: bool,
+        prev_interval_days: float,
+        new_interval_days: float,
+        prev_ease_factor: float,
+        new_ease_factor: float,
+    ) -> None:
+        try:
+            self.queue.put_nowait(
+                {
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "reviewed_at": reviewed_at,
+                    "is_correct": is_correct,
+                    "prev_interval_days": prev_interval_days,
+                    "new_interval_days": new_interval_days,
+                    "prev_ease_factor": prev_ease_factor,
+                    "new_ease_factor": new_ease_factor,
+                }
+            )
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Review log queue full, dropped event for question {question_id}")
+
+    async def _fill_batch(self) -> None:
+        # Collected on the instance so stop() can flush a partly filled batch.
+        self._batch.append(await self.queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _flush(self, batch: list[dict]) -> None:
+        try:
+            async with async_session() as db:
+                await db.execute(insert(ReviewEvent), batch)
+                await db.commit()
+        except IntegrityError:
+            # A question was deleted while its events were queued; foreign
+            # keys are enforced, so drop its events and keep the rest.
+            await self._flush_existing(batch)
+        except Exception:
+            logger.exception(f"Failed to write {len(batch)} review events")
+
+    async def _flush_existing(self, batch: list[dict]) -> None:
+        try:
+            async with async_session() as db:
+                question_ids = {event["question_id"] for event in batch}
+                stmt = select(Question.id).where(Question.id.in_(question_ids))
+                existing = set((await db.scalars(stmt)).all())
+                kept = [event for event in batch if event["question_id"] in existing]
+                if kept:
+                    await db.execute(insert(ReviewEvent), kept)
+                    await db.commit()
+            logger.info(f"Dropped {len(batch) - len(kept)} review events for deleted questions")
+        except Exception:
+            logger.exception(f"Failed to write {len(batch)} review events")
+
+    async def _run(self) -> None:
+        while True:
+            await self._fill_batch()
+            batch, self._batch = self._batch, []
+            # Shielded so a shutdown mid-insert lets the batch finish; stop()
+            # waits for it.
+            self._inflight = asyncio.create_task(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    def stats(self) -> dict:
+        return {"pending": self.queue.qsize(), "dropped": self.dropped}
+
+
+review_log = ReviewLogWriter(
+    batch_size=settings.review_log_batch_size,
+    flush_interval_ms=settings.review_log_flush_ms,
+    max_pending=settings.review_log_max_pending,
+)
@@ -1,76 +1,144 @@
 import random
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, select, literal, func, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.config import settings
 from app.models.question import Question
 from app.models.progress import UserProgress
 from app.models.video import Video
+from app.services.due_index import due_index
+
+REVIEW, NEW, REINFORCEMENT = 0, 1, 2
+
+# Only what the quiz card needs; answers and progress stay server-side.
+SESSION_COLUMNS = (
+    Question.id,
+    Question.video_id,
+    Question.question_text,
+    Question.choices,
+    Question.difficulty,
+    Question.created_at,
+)
+
+
+def _with_sort_keys(*keys):
+    """Select the session columns plus ascending sort keys labelled sort_0, sort_1, ..."""
+    return select(
+        *SESSION_COLUMNS, *(k.label(f"sort_{i}") for i, k in enumerate(keys))
+    ).select_from(Question)
+
+
+def _ranked(bucket: int, stmt, limit: int):
+    """Take the first `limit` rows of `stmt`, tagged with their bucket and rank."""
+    sort_keys = [c.key for c in stmt.selected_columns if c.key.startswith("sort_")]
+    candidates = (
+        stmt.order_by(*(stmt.selected_columns[k] for k in sort_keys)).limit(limit).subquery()
+    )
+    return select(
+        *(candidates.c[c.key] for c in SESSION_COLUMNS),
+        literal(bucket).label("bucket"),
+        func.row_number()
+        .over(order_by=[candidates.c[k] for k in sort_keys])
+        .label("priority_rank"),
+    )
 
 
 async def build_session(
-    db: AsyncSession, session_size: int | None = None
-) -> tuple[list[Question], int, int]:
-    """Build a daily quiz session. Returns (questions, review_count, new_count)."""
+    db: AsyncSession, user_id: str, session_size: int | None = None
+) -> tuple[list[Row], int, int]:
+    """Build a learner's daily quiz session. Returns (questions, review_count, new_count).
+
+    Due reviews (most overdue first), then new questions (oldest video, earliest
+    segment first), then the hardest remaining questions are picked in a single
+    query: each bucket contributes at most `size` ranked candidates, duplicates
+    keep their highest-priority bucket, and the first `size` rows win. A
+    question is new to a learner until they have a progress row for it.
+    """
     size = session_size or settings.default_session_size
     size = max(settings.min_session_size, min(size, settings.max_session_size))
     now = datetime.now(timezone.utc)
 
-    # 1. Due reviews — most overdue first
-    review_stmt = (
-        select(Question)
-        .join(UserProgress)
-        .where(UserProgress.next_review_at <= now)
-        .where(UserProgress.last_reviewed_at.isnot(None))
-        .order_by(UserProgress.next_review_at.asc())
-        .limit(min(size, settings.max_review_per_session))
-        .options(joinedload(Question.progress))
+    if settings.due_index_enabled:
+        if due_index.is_loaded(user_id):
+            return await _build_from_index(db, user_id, size, now)
+        due_index.ensure_loading(user_id)
+
+    own_progress = and_(
+        UserProgress.question_id == Question.id, UserProgress.user_id == user_id
     )
-    review_result = await db.execute(review_stmt)
-    review_questions = list(review_result.unique().scalars().all())
-    review_count = len(review_questions)
-
-    remaining = size - review_count
-    selected_ids = {q.id for q in review_questions}
-
-    # 2. New (unseen) questions
-    new_questions = []
-    if remaining > 0:
-        new_stmt = (
-            select(Question)
-            .join(UserProgress)
-            .join(Video)
-            .where(UserProgress.last_reviewed_at.is_(None))
-            .where(Question.id.notin_(selected_ids) if selected_ids else True)
-            .order_by(Video.created_at.asc(), Question.segment_start.asc())
-            .limit(remaining)
-            .options(joinedload(Question.progress))
-        )
-        new_result = await db.execute(new_stmt)
-        new_questions = list(new_result.unique().scalars().all())
-        selected_ids.update(q.id for q in new_questions)
-
-    new_count = len(new_questions)
-    remaining = size - review_count - new_count
-
-    # 3. Reinforcement backfill — hardest questions
-    reinforcement = []
-    if remaining > 0:
-        reinforce_stmt = (
-            select(Question)
-            .join(UserProgress)
-            .where(Question.id.notin_(selected_ids) if selected_ids else True)
-            .order_by(UserProgress.ease_factor.asc())
-            .limit(remaining)
-            .options(joinedload(Question.progress))
+    reviews = _ranked(
+        REVIEW,
+        _with_sort_keys(UserProgress.next_review_at)
+        .join(UserProgress, own_progress)
+        .where(UserProgress.next_review_at <= now),
+        min(size, settings.max_review_per_session),
+    )
+    new = _ranked(
+        NEW,
+        _with_sort_keys(Video.created_at, Question.segment_start)
+        .join(Video)
+        .outerjoin(UserProgress, own_progress)
+        .where(UserProgress.id.is_(None)),
+        size,
+    )
+    reinforcement = _ranked(
+        REINFORCEMENT,
+        _with_sort_keys(UserProgress.ease_factor).join(UserProgress, own_progress),
+        size,
+    )
+
+    candidates = union_all(reviews, new, reinforcement).subquery("candidates")
+    deduped = select(
+        candidates,
+        func.row_number()
+        .over(
+            partition_by=candidates.c.id,
+            order_by=[candidates.c.bucket, candidates.c.priority_rank],
         )
-        reinforce_result = await db.execute(reinforce_stmt)
-        reinforcement = list(reinforce_result.unique().scalars().all())
+        .label("occurrence"),
+    ).subquery("deduped")
+
+    stmt = (
+        select(*(deduped.c[c.key] for c in SESSION_COLUMNS), deduped.c.bucket)
+        .where(deduped.c.occurrence == 1)
+        .order_by(deduped.c.bucket, deduped.c.priority_rank)
+        .limit(size)
+    )
+    rows = list((await db.execute(stmt)).all())
+
+    review_count = sum(1 for r in rows if r.bucket == REVIEW)
+    new_count = sum(1 for r in rows if r.bucket == NEW)
+
+    random.shuffle(rows)
+
+    return rows, review_count, new_count
+
+
+async def _build_from_index(
+    db: AsyncSession, user_id: str, size: int, now: datetime
+) -> tuple[list[Row], int, int]:
+    """Same selection as the SQL path, with the buckets read from the due index."""
+    max_reviews = min(size, settings.max_review_per_session)
+    buckets = (
+        (REVIEW, due_index.due_reviews(user_id, now, max_reviews)),
+        (NEW, due_index.new_questions(user_id, size)),
+        (REINFORCEMENT, due_index.lowest_ease(user_id, size)),
+    )
+    picked: dict[str, int] = {}
+    for bucket, question_ids in buckets:
+        for question_id in question_ids:
+            if len(picked) == size:
+                break
+            picked.setdefault(question_id, bucket)
+
+    stmt = select(*SESSION_COLUMNS).where(Question.id.in_(picked))
+    rows = list((await db.execute(stmt)).all())
+
+    review_count = sum(1 for r in rows if picked[r.id] == REVIEW)
+    new_count = sum(1 for r in rows if picked[r.id] == NEW)
 
-    session = review_questions + new_questions + reinforcement
-    random.shuffle(session)
+    random.shuffle(rows)
 
-    return session, review_count, new_count
+    return rows, review_count, new_count
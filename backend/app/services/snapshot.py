@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import date
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Snapshot(Generic[T]):
+    """In-process cache of a computed value per key (e.g. per learner).
+
+    A key's value is recomputed on the first read after it (or every key) is
+    invalidated, or after the date changes (streaks depend on today's date).
+    A computation that overlaps an invalidation is returned but not stored.
+    The least recently read keys are dropped beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[T, date]] = OrderedDict()
+        self._generation = 0
+        # Per-key invalidation counts and computations in flight, kept only
+        # while a key has a computation in flight.
+        self._key_generations: dict[Hashable, int] = {}
+        self._computing: dict[Hashable, int] = {}
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one key's value, or every value when no key is given."""
+        if key is None:
+            self._generation += 1
+            self._entries.clear()
+        else:
+            if key in self._key_generations:
+                self._key_generations[key] += 1
+            self._entries.pop(key, None)
+
+    async def get(self, compute: Callable[[], Awaitable[T]], key: Hashable = None) -> T:
+        today = date.today()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == today:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        generation = (self._generation, self._key_generations.setdefault(key, 0))
+        self._computing[key] = self._computing.get(key, 0) + 1
+        try:
+            value = await compute()
+        finally:
+            current = (self._generation, self._key_generations[key])
+            self._computing[key] -= 1
+            if not self._computing[key]:
+                del self._computing[key]
+                del self._key_generations[key]
+        if generation == current:
+            self._entries[key] = (value, today)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+# Keyed by user id. Answers and completed sessions invalidate their learner;
+# videos being added or deleted invalidate everyone.
+overview_snapshot: Snapshot = Snapshot()
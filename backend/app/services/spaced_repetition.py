@@ -1,37 +1,102 @@
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
 
 from app.config import settings
 from app.models.progress import UserProgress
 
 
-def update_progress(progress: UserProgress, is_correct: bool) -> UserProgress:
+class ReviewState(NamedTuple):
+    """The SM-2 fields of a UserProgress row."""
+
+    repetitions: int
+    ease_factor: float
+    interval_days: float
+    times_correct: int
+    times_incorrect: int
+    streak: int
+    last_reviewed_at: datetime | None
+    next_review_at: datetime
+
+
+def initial_review_state(now: datetime) -> ReviewState:
+    """The state of a question the learner has never answered (the column defaults)."""
+    return ReviewState(
+        repetitions=0,
+        ease_factor=2.5,
+        interval_days=0.0,
+        times_correct=0,
+        times_incorrect=0,
+        streak=0,
+        last_reviewed_at=None,
+        next_review_at=now,
+    )
+
+
+def next_review_state(
+    state: ReviewState, is_correct: bool, now: datetime | None = None
+) -> ReviewState:
+    """Apply one SM-2 review to `state` and return the new state."""
+    repetitions = state.repetitions
+    interval_days = state.interval_days
+    times_correct = state.times_correct
+    times_incorrect = state.times_incorrect
+    streak = state.streak
+
     if is_correct:
         quality = 4
-        progress.times_correct += 1
-        progress.streak += 1
+        times_correct += 1
+        streak += 1
 
-        if progress.repetitions == 0:
-            progress.interval_days = settings.sm2_first_interval
-        elif progress.repetitions == 1:
-            progress.interval_days = settings.sm2_second_interval
+        if repetitions == 0:
+            interval_days = settings.sm2_first_interval
+        elif repetitions == 1:
+            interval_days = settings.sm2_second_interval
         else:
-            progress.interval_days = progress.interval_days * progress.ease_factor
+            interval_days = interval_days * state.ease_factor
 
-        progress.repetitions += 1
+        repetitions += 1
     else:
         quality = 1
-        progress.times_incorrect += 1
-        progress.streak = 0
-        progress.repetitions = 0
-        progress.interval_days = settings.sm2_incorrect_interval
+        times_incorrect += 1
+        streak = 0
+        repetitions = 0
+        interval_days = settings.sm2_incorrect_interval
 
-    progress.ease_factor = max(
+    ease_factor = max(
         settings.sm2_min_ease_factor,
-        progress.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)),
+        state.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)),
+    )
+
+    now = now or datetime.now(timezone.utc)
+    return ReviewState(
+        repetitions=repetitions,
+        ease_factor=ease_factor,
+        interval_days=interval_days,
+        times_correct=times_correct,
+        times_incorrect=times_incorrect,
+        streak=streak,
+        last_reviewed_at=now,
+        next_review_at=now + timedelta(days=interval_days),
     )
 
-    now = datetime.now(timezone.utc)
-    progress.last_reviewed_at = now
-    progress.next_review_at = now + timedelta(days=progress.interval_days)
 
+def update_progress(
+    progress: UserProgress, is_correct: bool, now: datetime | None = None
+) -> UserProgress:
+    state = ReviewState(*(getattr(progress, field) for field in ReviewState._fields))
+    for field, value in next_review_state(state, is_correct, now)._asdict().items():
+        setattr(progress, field, value)
     return progress
+
+
+def scheduled_interval(repetitions: int, ease_factor: float) -> float:
+    """The interval SM-2 would give a reviewed card with this streak and ease.
+
+    Used to reschedule cards after the `sm2_*` settings change; assumes the
+    ease factor was constant over the card's current run of correct answers.
+    """
+    if repetitions == 0:
+        return settings.sm2_incorrect_interval
+    if repetitions == 1:
+        return settings.sm2_first_interval
+    return settings.sm2_second_interval * ease_factor ** (repetitions - 2)
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.progress import StreakState
+
+
+async def get_streak_state(db: AsyncSession, user_id: str) -> StreakState:
+    state = await db.get(StreakState, user_id)
+    if state is None:
+        state = StreakState(user_id=user_id, current_streak=0, longest_streak=0)
+    return state
+
+
+def current_streak(state: StreakState | Row, today: date | None = None) -> int:
+    """Consecutive active days ending today; 0 until a session is completed today.
+
+    Accepts the state row or any result row carrying its `current_streak` and
+    `last_active_date` columns.
+    """
+    today = today or date.today()
+    return state.current_streak if state.last_active_date == today else 0
+
+
+async def record_active_day(
+    db: AsyncSession, user_id: str, today: date | None = None
+) -> StreakState:
+    """Advance the learner's streak for a completed session. The caller commits."""
+    today = today or date.today()
+    state = await db.get(StreakState, user_id)
+    if state is None:
+        state = StreakState(user_id=user_id, current_streak=0, longest_streak=0)
+        db.add(state)
+
+    if state.last_active_date == today:
+        return state
+
+    if state.last_active_date == today - timedelta(days=1):
+        state.current_streak += 1
+    else:
+        state.current_streak = 1
+    state.last_active_date = today
+    state.longest_streak = max(state.longest_streak, state.current_streak)
+    return state
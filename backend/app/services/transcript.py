@@ -1,7 +1,24 @@
 import re
+import bisect
+import asyncio
+from itertools import accumulate
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from app.config import settings
+from app.services.transcript_cache import TranscriptCache
+
+# youtube_transcript_api is blocking; fetches run here, off the event loop.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.transcript_fetch_workers, thread_name_prefix="transcript"
+)
+
+_cache = TranscriptCache(
+    settings.transcript_cache_dir, settings.transcript_cache_max_mb * 1024 * 1024
+)
+
 
 class TranscriptService:
     def __init__(self):
@@ -20,8 +37,8 @@ class TranscriptService:
                 return match.group(1)
         raise ValueError(f"Could not extract video ID from: {url}")
 
-    def fetch_transcript(self, video_id: str) -> dict:
-        transcript = self.api.fetch(video_id, languages=["en"])
+    def fetch_transcript(self, video_id: str, language: str | None = None) -> dict:
+        transcript = self.api.fetch(video_id, languages=[language or settings.transcript_language])
 
         segments = [
             {"text": snippet.text, "start": snippet.start, "duration": snippet.duration}
@@ -35,20 +52,61 @@ class TranscriptService:
             "full_text": full_text,
         }
 
+    def _fetch_cached(self, video_id: str, language: str) -> dict:
+        cached = _cache.get(video_id, language)
+        if cached is not None:
+            return cached
+        data = self.fetch_transcript(video_id, language)
+        _cache.put(video_id, language, data)
+        return data
+
+    async def fetch_transcript_async(self, video_id: str, language: str | None = None) -> dict:
+        """Fetch a transcript in the transcript thread pool, going through the disk cache."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor, self._fetch_cached, video_id, language or settings.transcript_language
+        )
+
     @staticmethod
-    def chunk_transcript(full_text: str, chunk_size: int = 600, overlap: int = 50) -> list[dict]:
-        words = full_text.split()
-        if not words:
-            return []
-
-        chunks = []
-        start = 0
-        while start < len(words):
-            end = min(start + chunk_size, len(words))
-            chunk_text = " ".join(words[start:end])
-            chunks.append({"text": chunk_text, "word_start": start, "word_end": end})
-            if end >= len(words):
-                break
-            start = end - overlap
-
-        return chunks
+    def chunk_transcript(
+        segments: list[dict], chunk_size: int = 600, overlap: int = 50
+    ) -> tuple[int, Iterator[dict]]:
+        """Split a transcript into overlapping word windows, lazily.
+
+        Returns the number of chunks and a generator of them. Each chunk has
+        its text, its word range and the start/end time of the segments it
+        spans. Only a chunk's own segments are split into words, so the cost
+        is linear in the transcript and nothing the size of the whole word
+        list is built.
+        """
+        # word_ends[i] is the number of words in segments[0..i].
+        word_ends = list(accumulate(len(s["text"].split()) for s in segments))
+        total = word_ends[-1] if word_ends else 0
+        if not total:
+            return 0, iter(())
+
+        step = max(1, chunk_size - overlap)
+        count = 1 + max(0, -(-(total - chunk_size) // step))
+
+        def chunks() -> Iterator[dict]:
+            for i in range(count):
+                word_start = i * step
+                word_end = min(word_start + chunk_size, total)
+                first = bisect.bisect_right(word_ends, word_start)
+                last = bisect.bisect_right(word_ends, word_end - 1)
+
+                words: list[str] = []
+                for seg in range(first, last + 1):
+                    offset = word_ends[seg - 1] if seg else 0
+                    seg_words = segments[seg]["text"].split()
+                    words.extend(seg_words[max(0, word_start - offset) : word_end - offset])
+
+                yield {
+                    "text": " ".join(words),
+                    "word_start": word_start,
+                    "word_end": word_end,
+                    "start": segments[first]["start"],
+                    "end": segments[last]["start"] + segments[last]["duration"],
+                }
+
+        return count, chunks()
@@ -0,0 +1,78 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """On-disk cache of fetched transcripts, keyed by youtube_id and language.
+
+    Entries are gzipped JSON files named by the SHA-256 of the key. Reads bump
+    the file's mtime, and writes evict the least recently used files once the
+    directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, youtube_id: str, language: str) -> Path:
+        digest = hashlib.sha256(f"{youtube_id}:{language}".encode()).hexdigest()
+        return self.directory / f"{digest}.json.gz"
+
+    def get(self, youtube_id: str, language: str) -> dict | None:
+        path = self._path(youtube_id, language)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable transcript cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, youtube_id: str, language: str, data: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(youtube_id, language)
+        # A unique temp name per write, so concurrent writers of one entry
+        # never share (and half-write) the file that gets moved into place.
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as raw:
+            try:
+                with gzip.open(raw, "wt", encoding="utf-8") as f:
+                    json.dump(data, f)
+            except BaseException:
+                raw.close()
+                os.unlink(raw.name)
+                raise
+        os.replace(raw.name, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,20 @@
+from fastapi import Header, HTTPException
+
+from app.config import settings
+
+MAX_USER_ID_LENGTH = 64
+
+
+async def get_user_id(x_user_id: str | None = Header(None)) -> str:
+    """The learner a request acts for.
+
+    Taken from the X-User-Id header, which an authenticating proxy in front
+    of the API is expected to set; requests without it act for the default
+    user, so a single-learner deployment needs no changes.
+    """
+    if x_user_id is None:
+        return settings.default_user_id
+    user_id = x_user_id.strip()
+    if not user_id or len(user_id) > MAX_USER_ID_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid X-User-Id header")
+    return user_id
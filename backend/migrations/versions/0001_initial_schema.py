@@ -0,0 +1,122 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Databases created by the old ``Base.metadata.create_all`` bootstrap have
+these tables but no alembic_version row, so every table is only created
+when it does not exist yet.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "videos" not in existing:
+        op.create_table(
+            "videos",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("youtube_id", sa.String(), nullable=False),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("channel", sa.String(), nullable=True),
+            sa.Column("thumbnail_url", sa.String(), nullable=False),
+            sa.Column("transcript_text", sa.Text(), nullable=False),
+            sa.Column("transcript_segments", sa.JSON(), nullable=False),
+            sa.Column("question_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_videos_youtube_id", "videos", ["youtube_id"], unique=True)
+
+    if "questions" not in existing:
+        op.create_table(
+            "questions",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column(
+                "video_id",
+                sa.String(),
+                sa.ForeignKey("videos.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("question_text", sa.Text(), nullable=False),
+            sa.Column("choices", sa.JSON(), nullable=False),
+            sa.Column("correct_choice_id", sa.String(), nullable=False),
+            sa.Column("explanation", sa.Text(), nullable=False),
+            sa.Column("segment_start", sa.Float(), nullable=True),
+            sa.Column("segment_end", sa.Float(), nullable=True),
+            sa.Column("difficulty", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+    if "user_progress" not in existing:
+        op.create_table(
+            "user_progress",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column(
+                "question_id",
+                sa.String(),
+                sa.ForeignKey("questions.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("repetitions", sa.Integer(), nullable=False),
+            sa.Column("ease_factor", sa.Float(), nullable=False),
+            sa.Column("interval_days", sa.Float(), nullable=False),
+            sa.Column("next_review_at", sa.DateTime(), nullable=False),
+            sa.Column("last_reviewed_at", sa.DateTime(), nullable=True),
+            sa.Column("times_correct", sa.Integer(), nullable=False),
+            sa.Column("times_incorrect", sa.Integer(), nullable=False),
+            sa.Column("streak", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_user_progress_question_id", "user_progress", ["question_id"], unique=True
+        )
+
+    if "daily_stats" not in existing:
+        op.create_table(
+            "daily_stats",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("questions_answered", sa.Integer(), nullable=False),
+            sa.Column("questions_correct", sa.Integer(), nullable=False),
+            sa.Column("session_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_daily_stats_date", "daily_stats", ["date"], unique=True)
+
+    if "ingest_jobs" not in existing:
+        op.create_table(
+            "ingest_jobs",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("youtube_id", sa.String(), nullable=False),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("video_id", sa.String(), nullable=True),
+            sa.Column("chunks_total", sa.Integer(), nullable=False),
+            sa.Column("chunks_done", sa.Integer(), nullable=False),
+            sa.Column("question_count", sa.Integer(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_ingest_jobs_youtube_id", "ingest_jobs", ["youtube_id"])
+        op.create_index("ix_ingest_jobs_status", "ingest_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("ingest_jobs")
+    op.drop_table("daily_stats")
+    op.drop_table("user_progress")
+    op.drop_table("questions")
+    op.drop_table("videos")
@@ -0,0 +1,40 @@
+"""indexes for the session builder and library queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Due reviews: range on next_review_at, ordered by it, filtered on last_reviewed_at.
+    op.create_index(
+        "ix_user_progress_due", "user_progress", ["next_review_at", "last_reviewed_at"]
+    )
+    # New questions: equality on last_reviewed_at IS NULL, covering the join key.
+    op.create_index(
+        "ix_user_progress_unseen", "user_progress", ["last_reviewed_at", "question_id"]
+    )
+    # Reinforcement backfill: ordered walk by ease_factor, covering the join key.
+    op.create_index(
+        "ix_user_progress_ease", "user_progress", ["ease_factor", "question_id"]
+    )
+    op.create_index(
+        "ix_questions_video_segment", "questions", ["video_id", "segment_start"]
+    )
+    op.create_index("ix_videos_created_at", "videos", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_created_at", table_name="videos")
+    op.drop_index("ix_questions_video_segment", table_name="questions")
+    op.drop_index("ix_user_progress_ease", table_name="user_progress")
+    op.drop_index("ix_user_progress_unseen", table_name="user_progress")
+    op.drop_index("ix_user_progress_due", table_name="user_progress")
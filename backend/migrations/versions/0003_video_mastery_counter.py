@@ -0,0 +1,36 @@
+"""per-video mastered question counter
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(
+            sa.Column("mastered_count", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    op.execute(
+        """
+        UPDATE videos SET mastered_count = (
+            SELECT COUNT(*) FROM questions
+            JOIN user_progress ON user_progress.question_id = questions.id
+            WHERE questions.video_id = videos.id AND user_progress.repetitions >= 3
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("mastered_count")
@@ -0,0 +1,65 @@
+"""incrementally maintained streak state
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    streak_state = op.create_table(
+        "streak_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("last_active_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    # Replay existing history once so the state starts out correct.
+    dates = [
+        row[0]
+        for row in op.get_bind().execute(
+            sa.text("SELECT date FROM daily_stats ORDER BY date ASC")
+        )
+    ]
+    if not dates:
+        return
+
+    # SQLite hands raw text back for a textual SELECT.
+    dates = [
+        datetime.strptime(d, "%Y-%m-%d").date() if isinstance(d, str) else d for d in dates
+    ]
+    current = longest = 0
+    previous = None
+    for d in dates:
+        current = current + 1 if previous and (d - previous).days == 1 else 1
+        longest = max(longest, current)
+        previous = d
+
+    op.bulk_insert(
+        streak_state,
+        [
+            {
+                "id": 1,
+                "current_streak": current,
+                "longest_streak": longest,
+                "last_active_date": previous,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("streak_state")
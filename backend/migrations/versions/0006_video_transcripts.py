@@ -0,0 +1,102 @@
+"""move transcripts out of videos into compressed video_transcripts rows
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+import sys
+import json
+import zlib
+from array import array
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Mirrors the encoding in app/models/transcript.py at the time of writing.
+SEGMENT_SEPARATOR = "\x00"
+
+
+def _pack_floats(values: list[float]) -> bytes:
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return zlib.compress(packed.tobytes())
+
+
+def _unpack_floats(blob: bytes) -> list[float]:
+    values = array("d")
+    values.frombytes(zlib.decompress(blob))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return list(values)
+
+
+def upgrade() -> None:
+    transcripts = op.create_table(
+        "video_transcripts",
+        sa.Column(
+            "video_id",
+            sa.String(),
+            sa.ForeignKey("videos.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("segment_count", sa.Integer(), nullable=False),
+        sa.Column("texts", sa.LargeBinary(), nullable=False),
+        sa.Column("starts", sa.LargeBinary(), nullable=False),
+        sa.Column("durations", sa.LargeBinary(), nullable=False),
+    )
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, transcript_segments FROM videos"))
+    for video_id, raw_segments in rows:
+        segments = json.loads(raw_segments) if isinstance(raw_segments, str) else raw_segments
+        segments = segments or []
+        conn.execute(
+            transcripts.insert().values(
+                video_id=video_id,
+                segment_count=len(segments),
+                texts=zlib.compress(
+                    SEGMENT_SEPARATOR.join(s["text"] for s in segments).encode()
+                ),
+                starts=_pack_floats([s["start"] for s in segments]),
+                durations=_pack_floats([s["duration"] for s in segments]),
+            )
+        )
+
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("transcript_text")
+        batch.drop_column("transcript_segments")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("transcript_text", sa.Text(), nullable=False, server_default=""))
+        batch.add_column(
+            sa.Column("transcript_segments", sa.JSON(), nullable=False, server_default="[]")
+        )
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT video_id, segment_count, texts, starts, durations FROM video_transcripts")
+    )
+    for video_id, count, texts, starts, durations in rows.all():
+        texts = zlib.decompress(texts).decode().split(SEGMENT_SEPARATOR) if count else []
+        segments = [
+            {"text": t, "start": s, "duration": d}
+            for t, s, d in zip(texts, _unpack_floats(starts), _unpack_floats(durations))
+        ]
+        conn.execute(
+            sa.text(
+                "UPDATE videos SET transcript_text = :text, transcript_segments = :segments"
+                " WHERE id = :id"
+            ),
+            {"text": " ".join(texts), "segments": json.dumps(segments), "id": video_id},
+        )
+
+    op.drop_table("video_transcripts")
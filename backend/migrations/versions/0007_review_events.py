@@ -0,0 +1,43 @@
+"""append-only review event log
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "question_id",
+            sa.String(),
+            sa.ForeignKey("questions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("reviewed_at", sa.DateTime(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.Column("prev_interval_days", sa.Float(), nullable=False),
+        sa.Column("new_interval_days", sa.Float(), nullable=False),
+        sa.Column("prev_ease_factor", sa.Float(), nullable=False),
+        sa.Column("new_ease_factor", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ix_review_events_question_reviewed", "review_events", ["question_id", "reviewed_at"]
+    )
+    op.create_index("ix_review_events_reviewed_at", "review_events", ["reviewed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_events_reviewed_at", table_name="review_events")
+    op.drop_index("ix_review_events_question_reviewed", table_name="review_events")
+    op.drop_table("review_events")
@@ -0,0 +1,51 @@
+"""timezone-aware timestamps and JSONB choices on PostgreSQL
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# All timestamps are written as UTC. SQLite keeps them as text either way,
+# so only PostgreSQL needs its columns converted.
+TIMESTAMP_COLUMNS = {
+    "videos": ["created_at", "updated_at"],
+    "questions": ["created_at"],
+    "user_progress": ["next_review_at", "last_reviewed_at", "created_at", "updated_at"],
+    "daily_stats": ["created_at"],
+    "streak_state": ["updated_at"],
+    "ingest_jobs": ["created_at", "updated_at"],
+    "review_events": ["reviewed_at"],
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMP WITH TIME ZONE"
+                f" USING {column} AT TIME ZONE 'UTC'"
+            )
+    op.execute("ALTER TABLE questions ALTER COLUMN choices TYPE JSONB USING choices::jsonb")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE questions ALTER COLUMN choices TYPE JSON USING choices::json")
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMP WITHOUT TIME ZONE"
+                f" USING {column} AT TIME ZONE 'UTC'"
+            )
@@ -0,0 +1,162 @@
+"""partition progress, stats, streaks and mastery by user
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# Existing single-learner data is attributed to the default user, the one
+# header-less requests act as.
+DEFAULT_USER_ID = settings.default_user_id
+
+
+def _add_user_id(table: str) -> None:
+    # The server default only backfills existing rows; new rows name their user.
+    with op.batch_alter_table(table) as batch:
+        batch.add_column(
+            sa.Column("user_id", sa.String(), nullable=False, server_default=DEFAULT_USER_ID)
+        )
+    with op.batch_alter_table(table) as batch:
+        batch.alter_column("user_id", server_default=None)
+
+
+def _execute(sql: str) -> None:
+    op.execute(sa.text(sql).bindparams(user_id=DEFAULT_USER_ID))
+
+
+def upgrade() -> None:
+    # Progress rows are now created on a learner's first answer, so untouched
+    # placeholder rows go away and "new" means "no row for this user".
+    op.execute("DELETE FROM user_progress WHERE last_reviewed_at IS NULL")
+    op.drop_index("ix_user_progress_due", table_name="user_progress")
+    op.drop_index("ix_user_progress_unseen", table_name="user_progress")
+    op.drop_index("ix_user_progress_ease", table_name="user_progress")
+    op.drop_index("ix_user_progress_question_id", table_name="user_progress")
+    _add_user_id("user_progress")
+    op.create_index("ix_user_progress_question_id", "user_progress", ["question_id"])
+    op.create_index(
+        "ix_user_progress_user_question", "user_progress", ["user_id", "question_id"], unique=True
+    )
+    op.create_index("ix_user_progress_user_due", "user_progress", ["user_id", "next_review_at"])
+    op.create_index("ix_user_progress_user_ease", "user_progress", ["user_id", "ease_factor"])
+
+    op.drop_index("ix_daily_stats_date", table_name="daily_stats")
+    _add_user_id("daily_stats")
+    op.create_index("ix_daily_stats_user_date", "daily_stats", ["user_id", "date"], unique=True)
+
+    _add_user_id("review_events")
+    op.create_index("ix_review_events_user_reviewed", "review_events", ["user_id", "reviewed_at"])
+
+    op.rename_table("streak_state", "streak_state_single")
+    op.create_table(
+        "streak_state",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("last_active_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    _execute(
+        "INSERT INTO streak_state"
+        " (user_id, current_streak, longest_streak, last_active_date, updated_at)"
+        " SELECT :user_id, current_streak, longest_streak, last_active_date,"
+        " updated_at FROM streak_state_single"
+    )
+    op.drop_table("streak_state_single")
+
+    op.create_table(
+        "video_mastery",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column(
+            "video_id",
+            sa.String(),
+            sa.ForeignKey("videos.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("mastered_count", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_video_mastery_video", "video_mastery", ["video_id"])
+    _execute(
+        "INSERT INTO video_mastery (user_id, video_id, mastered_count)"
+        " SELECT :user_id, id, mastered_count FROM videos WHERE mastered_count > 0"
+    )
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("mastered_count")
+
+
+def downgrade() -> None:
+    # Only the default user's data fits the single-learner schema.
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(
+            sa.Column("mastered_count", sa.Integer(), nullable=False, server_default="0")
+        )
+    _execute(
+        "UPDATE videos SET mastered_count = COALESCE((SELECT mastered_count FROM video_mastery"
+        " WHERE video_mastery.video_id = videos.id AND user_id = :user_id), 0)"
+    )
+    op.drop_index("ix_video_mastery_video", table_name="video_mastery")
+    op.drop_table("video_mastery")
+
+    op.rename_table("streak_state", "streak_state_by_user")
+    op.create_table(
+        "streak_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("last_active_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    _execute(
+        "INSERT INTO streak_state"
+        " (id, current_streak, longest_streak, last_active_date, updated_at)"
+        " SELECT 1, current_streak, longest_streak, last_active_date, updated_at"
+        " FROM streak_state_by_user WHERE user_id = :user_id"
+    )
+    op.drop_table("streak_state_by_user")
+
+    for table in ("review_events", "daily_stats", "user_progress"):
+        _execute(f"DELETE FROM {table} WHERE user_id != :user_id")
+
+    op.drop_index("ix_review_events_user_reviewed", table_name="review_events")
+    with op.batch_alter_table("review_events") as batch:
+        batch.drop_column("user_id")
+
+    op.drop_index("ix_daily_stats_user_date", table_name="daily_stats")
+    with op.batch_alter_table("daily_stats") as batch:
+        batch.drop_column("user_id")
+    op.create_index("ix_daily_stats_date", "daily_stats", ["date"], unique=True)
+
+    op.drop_index("ix_user_progress_user_ease", table_name="user_progress")
+    op.drop_index("ix_user_progress_user_due", table_name="user_progress")
+    op.drop_index("ix_user_progress_user_question", table_name="user_progress")
+    op.drop_index("ix_user_progress_question_id", table_name="user_progress")
+    with op.batch_alter_table("user_progress") as batch:
+        batch.drop_column("user_id")
+    op.create_index(
+        "ix_user_progress_question_id", "user_progress", ["question_id"], unique=True
+    )
+    op.create_index(
+        "ix_user_progress_due", "user_progress", ["next_review_at", "last_reviewed_at"]
+    )
+    op.create_index(
+        "ix_user_progress_unseen", "user_progress", ["last_reviewed_at", "question_id"]
+    )
+    op.create_index("ix_user_progress_ease", "user_progress", ["ease_factor", "question_id"])
+    # Questions nobody had answered need their placeholder rows back.
+    op.execute(
+        "INSERT INTO user_progress (id, question_id, repetitions, ease_factor, interval_days,"
+        " next_review_at, times_correct, times_incorrect, streak, created_at, updated_at)"
+        " SELECT questions.id, questions.id, 0, 2.5, 0.0, questions.created_at, 0, 0, 0,"
+        " questions.created_at, questions.created_at FROM questions"
+        " WHERE NOT EXISTS (SELECT 1 FROM user_progress WHERE question_id = questions.id)"
+    )
@@ -0,0 +1,47 @@
+"""question minhash signatures and lsh buckets
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "question_signatures",
+        sa.Column(
+            "question_id",
+            sa.String(),
+            sa.ForeignKey("questions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+    )
+    op.create_table(
+        "question_lsh_buckets",
+        sa.Column("bucket", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column(
+            "question_id",
+            sa.String(),
+            sa.ForeignKey("questions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    op.create_index(
+        "ix_question_lsh_buckets_question", "question_lsh_buckets", ["question_id"]
+    )
+    # Existing questions are indexed by `python -m scripts.index_question_signatures`.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_question_lsh_buckets_question", table_name="question_lsh_buckets")
+    op.drop_table("question_lsh_buckets")
+    op.drop_table("question_signatures")
@@ -0,0 +1,222 @@
+"""Time the NumPy batch scheduler and check it against the scalar SM-2 code.
+
+Times the array math on its own, then the whole path against a temporary
+SQLite database seeded with `--db-cards` progress rows: loading them into
+arrays, and `reschedule_all` including its write-back. Exits non-zero if
+any checked card differs from the scalar result by more than RTOL (floats)
+or a microsecond (due times).
+
+Usage (from backend/):
+    python -m scripts.bench_batch_scheduler [--cards 1000000] [--days 30] [--check 20000]
+        [--db-cards 1000000]
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import init_db
+from app.models.progress import UserProgress
+from app.models.question import Question
+from app.models.video import Video
+from app.services.batch_scheduler import (
+    ProgressArrays,
+    forecast_due_counts,
+    from_days,
+    load_progress_arrays,
+    next_review_states,
+    reschedule,
+    reschedule_all,
+    scheduled_intervals,
+    to_days,
+)
+from app.services.spaced_repetition import ReviewState, next_review_state, scheduled_interval
+
+# Relative tolerance for float results; real scheduling bugs are far larger.
+RTOL = 1e-12
+
+# Seeded learners each have a progress row for every one of these questions.
+DB_QUESTIONS = 1000
+SEED_BATCH = 50_000
+
+
+def _fake_progress(n: int, today: date, rng: np.random.Generator) -> ProgressArrays:
+    start = np.datetime64(today, "D").astype(np.int64)
+    repetitions = rng.integers(0, 8, n)
+    ease = rng.uniform(1.3, 3.0, n)
+    interval = np.where(repetitions == 0, 0.25, rng.uniform(1, 60, n))
+    last_reviewed = start - rng.uniform(0, 60, n)
+    last_reviewed[rng.random(n) < 0.2] = np.nan  # unseen
+    return ProgressArrays(
+        ids=[str(i) for i in range(n)],
+        repetitions=repetitions,
+        ease_factor=ease,
+        interval_days=interval,
+        last_reviewed_at=last_reviewed,
+        next_review_at=np.where(np.isnan(last_reviewed), start, last_reviewed + interval),
+    )
+
+
+def _close(expected: float, actual: float) -> bool:
+    # NumPy's vectorized pow can differ from Python's by an ulp or so.
+    return bool(np.isclose(expected, actual, rtol=RTOL, atol=0.0))
+
+
+def _check_against_scalar(progress: ProgressArrays, n: int, rng: np.random.Generator) -> int:
+    sample = rng.choice(len(progress.ids), size=min(n, len(progress.ids)), replace=False)
+    is_correct = rng.random(sample.size) < 0.8
+    repetitions, ease, interval = next_review_states(
+        progress.repetitions[sample],
+        progress.ease_factor[sample],
+        progress.interval_days[sample],
+        is_correct,
+    )
+    expected_intervals = scheduled_intervals(
+        progress.repetitions[sample], progress.ease_factor[sample]
+    )
+
+    now = datetime.now(timezone.utc)
+    batch_next = from_days(to_days([now])[0] + interval)
+    mismatches = 0
+    for k, i in enumerate(sample.tolist()):
+        state = next_review_state(
+            ReviewState(
+                repetitions=int(progress.repetitions[i]),
+                ease_factor=float(progress.ease_factor[i]),
+                interval_days=float(progress.interval_days[i]),
+                times_correct=0,
+                times_incorrect=0,
+                streak=0,
+                last_reviewed_at=None,
+                next_review_at=now,
+            ),
+            bool(is_correct[k]),
+            now,
+        )
+        expected_next = state.next_review_at.replace(tzinfo=None)
+        if (
+            state.repetitions != repetitions[k]
+            or not _close(state.ease_factor, ease[k])
+            or not _close(state.interval_days, interval[k])
+            or abs(expected_next - batch_next[k]) > timedelta(microseconds=1)
+            or not _close(
+                scheduled_interval(int(progress.repetitions[i]), float(progress.ease_factor[i])),
+                expected_intervals[k],
+            )
+        ):
+            mismatches += 1
+    print(f"checked {sample.size:,} cards against the scalar functions: {mismatches} mismatches")
+    return mismatches
+
+
+async def _seed(db: AsyncSession, progress: ProgressArrays) -> None:
+    video = Video(youtube_id="benchmark00", url="")
+    db.add(video)
+    await db.flush()
+    question_ids = [str(uuid.uuid4()) for _ in range(DB_QUESTIONS)]
+    await db.execute(
+        insert(Question),
+        [
+            {
+                "id": qid,
+                "video_id": video.id,
+                "question_text": "?",
+                "choices": [],
+                "correct_choice_id": "",
+            }
+            for qid in question_ids
+        ],
+    )
+
+    last_reviewed = from_days(np.nan_to_num(progress.last_reviewed_at))
+    next_review = from_days(progress.next_review_at)
+    for start in range(0, len(progress.ids), SEED_BATCH):
+        await db.execute(
+            insert(UserProgress),
+            [
+                {
+                    "user_id": f"user{i // DB_QUESTIONS}",
+                    "question_id": question_ids[i % DB_QUESTIONS],
+                    "repetitions": int(progress.repetitions[i]),
+                    "ease_factor": float(progress.ease_factor[i]),
+                    "interval_days": float(progress.interval_days[i]),
+                    "last_reviewed_at": (
+                        None if np.isnan(progress.last_reviewed_at[i]) else last_reviewed[i]
+                    ),
+                    "next_review_at": next_review[i],
+                }
+                for i in range(start, min(start + SEED_BATCH, len(progress.ids)))
+            ],
+        )
+    await db.commit()
+
+
+async def _bench_db(progress: ProgressArrays) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        await init_db(engine)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            await _seed(db, progress)
+
+        async with session_factory() as db:
+            started = time.perf_counter()
+            loaded = await load_progress_arrays(db)
+            print(
+                f"load {len(loaded.ids):,} rows into arrays: "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+
+        async with session_factory() as db:
+            started = time.perf_counter()
+            rescheduled = await reschedule_all(db)
+            print(
+                f"reschedule_all over {len(loaded.ids):,} rows (load, math, write-back): "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms ({rescheduled:,} updated)"
+            )
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--check", type=int, default=20_000)
+    parser.add_argument("--db-cards", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    today = datetime.now(timezone.utc).date()
+    progress = _fake_progress(args.cards, today, rng)
+
+    started = time.perf_counter()
+    counts = forecast_due_counts(progress, today, args.days)
+    print(
+        f"forecast {args.days} days over {args.cards:,} cards: "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms ({counts.sum():,} reviews)"
+    )
+
+    started = time.perf_counter()
+    changed, _, _ = reschedule(progress)
+    print(
+        f"reschedule {args.cards:,} cards: "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms ({changed.sum():,} changed)"
+    )
+
+    if args.db_cards:
+        asyncio.run(_bench_db(_fake_progress(args.db_cards, today, rng)))
+
+    if _check_against_scalar(progress, args.check, rng):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare per-object ORM inserts with the bulk question insert path.
+
+Usage (from backend/):
+    python -m scripts.bench_bulk_insert [--sizes 1000 10000]
+"""
+
+import uuid
+import time
+import asyncio
+import argparse
+import tempfile
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+import app.models  # noqa: F401  (registers tables on Base.metadata)
+from app.ai.base import GeneratedChoice, GeneratedQuestion
+from app.database import Base
+from app.models.question import Question
+from app.models.video import Video
+from app.services.question_store import bulk_insert_questions
+
+
+def _fake_questions(n: int) -> list[GeneratedQuestion]:
+    return [
+        GeneratedQuestion(
+            question_text=f"Benchmark question {i}?",
+            choices=[
+                GeneratedChoice(id=f"c{i}{j}", text=f"Choice {j}", is_correct=j == 0)
+                for j in range(4)
+            ],
+            correct_choice_id=f"c{i}0",
+            explanation="Because.",
+            difficulty="medium",
+        )
+        for i in range(n)
+    ]
+
+
+async def _orm_path(db: AsyncSession, video_id: str, generated: list[GeneratedQuestion]) -> None:
+    for gq in generated:
+        question = Question(
+            id=str(uuid.uuid4()),
+            video_id=video_id,
+            question_text=gq.question_text,
+            choices=[c.model_dump() for c in gq.choices],
+            correct_choice_id=gq.correct_choice_id,
+            explanation=gq.explanation,
+            difficulty=gq.difficulty,
+        )
+        db.add(question)
+
+
+async def _bulk_path(db: AsyncSession, video_id: str, generated: list[GeneratedQuestion]) -> None:
+    await bulk_insert_questions(db, video_id, generated)
+
+
+async def _run(path, n: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        generated = _fake_questions(n)
+        async with session_factory() as db:
+            video = Video(id=str(uuid.uuid4()), youtube_id="benchmark00", url="")
+            db.add(video)
+            await db.commit()
+
+            start = time.perf_counter()
+            await path(db, video.id, generated)
+            await db.commit()
+            elapsed = time.perf_counter() - start
+
+        await engine.dispose()
+        return elapsed
+
+
+async def main(sizes: list[int]) -> None:
+    print(f"{'questions':>10} {'orm (s)':>10} {'bulk (s)':>10} {'speedup':>8}")
+    for n in sizes:
+        orm = await _run(_orm_path, n)
+        bulk = await _run(_bulk_path, n)
+        print(f"{n:>10} {orm:>10.3f} {bulk:>10.3f} {orm / bulk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
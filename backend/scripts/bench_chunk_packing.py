@@ -0,0 +1,151 @@
+"""Compare per-chunk and packed generation requests against a simulated provider.
+
+The simulated provider sleeps for a fixed per-request overhead plus time
+proportional to the prompt and to the questions it returns, so the numbers
+show request counts and the shape of the latency change, not real model
+timings.
+
+Usage (from backend/):
+    python -m scripts.bench_chunk_packing [--minutes 10 20 30] [--overhead-ms 800]
+"""
+
+import time
+import asyncio
+import argparse
+import tempfile
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from app.ai.base import AIProvider, GeneratedChoice, GeneratedQuestion
+from app.ai.prompts import SYSTEM_PROMPT, estimate_tokens
+from app.config import settings
+from app.database import init_db
+from app.models.video import Video
+from app.services.quiz_generator import QuizGenerator
+
+# Roughly 150 spoken words per minute, in caption-sized segments.
+WORDS_PER_MINUTE = 150
+WORDS_PER_SEGMENT = 10
+
+
+class SimulatedProvider(AIProvider):
+    name = "simulated"
+
+    def __init__(self, batching: bool, overhead: float, per_token: float, per_question: float):
+        self.supports_batching = batching
+        self.overhead = overhead
+        self.per_token = per_token
+        self.per_question = per_question
+        self.requests = 0
+        self._serial = 0
+
+    def _questions(self, n: int) -> list[GeneratedQuestion]:
+        questions = []
+        for _ in range(n):
+            self._serial += 1
+            questions.append(
+                GeneratedQuestion(
+                    question_text=f"Simulated question number {self._serial} about topic "
+                    f"{self._serial * 7919 % 104729}?",
+                    choices=[
+                        GeneratedChoice(id=f"c{j}", text=f"Choice {j}", is_correct=j == 0)
+                        for j in range(4)
+                    ],
+                    correct_choice_id="c0",
+                    explanation="Because.",
+                    difficulty="medium",
+                )
+            )
+        return questions
+
+    async def _respond(self, prompt_tokens: int, n_questions: int) -> None:
+        self.requests += 1
+        await asyncio.sleep(
+            self.overhead + prompt_tokens * self.per_token + n_questions * self.per_question
+        )
+
+    async def generate_questions(
+        self,
+        transcript_chunk: str,
+        num_questions: int = 4,
+    ) -> list[GeneratedQuestion]:
+        await self._respond(estimate_tokens(SYSTEM_PROMPT + transcript_chunk), num_questions)
+        return self._questions(num_questions)
+
+    async def generate_questions_batch(
+        self,
+        transcript_chunks: list[str],
+        num_questions: int = 4,
+    ) -> list[list[GeneratedQuestion]]:
+        if not self.supports_batching:
+            return await super().generate_questions_batch(transcript_chunks, num_questions)
+        prompt_tokens = estimate_tokens(SYSTEM_PROMPT + "".join(transcript_chunks))
+        await self._respond(prompt_tokens, num_questions * len(transcript_chunks))
+        return [self._questions(num_questions) for _ in transcript_chunks]
+
+    async def health_check(self) -> bool:
+        return True
+
+
+def _segments(minutes: int) -> list[dict]:
+    n = minutes * WORDS_PER_MINUTE // WORDS_PER_SEGMENT
+    seconds = 60 / (WORDS_PER_MINUTE / WORDS_PER_SEGMENT)
+    return [
+        {
+            "text": " ".join(f"word{i * WORDS_PER_SEGMENT + j}" for j in range(WORDS_PER_SEGMENT)),
+            "start": i * seconds,
+            "duration": seconds,
+        }
+        for i in range(n)
+    ]
+
+
+async def _run(session_factory, provider: SimulatedProvider, minutes: int) -> float:
+    async with session_factory() as db:
+        video = Video(youtube_id=f"bench{minutes:02d}{provider.supports_batching:d}", url="")
+        db.add(video)
+        await db.flush()
+        start = time.perf_counter()
+        await QuizGenerator(provider).generate_questions_for_video(
+            db, video.id, _segments(minutes)
+        )
+        elapsed = time.perf_counter() - start
+        await db.commit()
+    return elapsed
+
+
+async def main(minutes: list[int], overhead_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        await init_db(engine)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        print(
+            f"{'minutes':>8} {'chunks':>7} {'requests':>9} {'packed':>7} "
+            f"{'time (s)':>9} {'packed (s)':>11}"
+        )
+        for m in minutes:
+            runs = {}
+            for batching in (False, True):
+                provider = SimulatedProvider(batching, overhead_ms / 1000, 0.0002, 0.3)
+                elapsed = await _run(session_factory, provider, m)
+                runs[batching] = (provider.requests, elapsed)
+            chunks = runs[False][0]
+            print(
+                f"{m:>8} {chunks:>7} {runs[False][0]:>9} {runs[True][0]:>7} "
+                f"{runs[False][1]:>9.2f} {runs[True][1]:>11.2f}"
+            )
+
+        await engine.dispose()
+    print(
+        f"(concurrency {settings.generation_concurrency}, budget "
+        f"{settings.ai_batch_token_budget} tokens / {settings.ai_batch_max_chunks} chunks)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument("--overhead-ms", type=float, default=800)
+    args = parser.parse_args()
+    asyncio.run(main(args.minutes, args.overhead_ms))
@@ -0,0 +1,139 @@
+"""Compare tail latency of one provider with hedging across two, using local mock servers.
+
+Starts an OpenAI-compatible and an Anthropic-compatible mock server on
+localhost. Each answers after a short random delay, but a share of requests
+(`--stall-rate`) stalls for `--stall-seconds`, like a vendor having a bad
+minute. The same requests are then sent through OpenAIProvider alone and
+through a HedgedProvider over both, and the latency percentiles compared.
+
+Usage (from backend/):
+    python -m scripts.bench_hedging [--requests 300] [--stall-rate 0.05]
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.ai.anthropic import AnthropicProvider
+from app.ai.hedged import HedgedProvider
+from app.ai.http import close_http_client
+from app.ai.openai import OpenAIProvider
+
+REPLY = json.dumps(
+    {
+        "questions": [
+            {
+                "question_text": "What does the mock server return?",
+                "choices": [
+                    {"label": label, "text": f"Choice {label}", "is_correct": label == "A"}
+                    for label in "ABCD"
+                ],
+                "explanation": "It always returns this question.",
+                "difficulty": "easy",
+            }
+        ]
+    }
+)
+
+
+def _handler(body: dict, stall_rate: float, stall_seconds: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            delay = random.uniform(0.05, 0.15)
+            if random.random() < stall_rate:
+                delay = stall_seconds
+            time.sleep(delay)
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _serve(body: dict, stall_rate: float, stall_seconds: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(body, stall_rate, stall_seconds))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _measure(provider, n: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            questions = await provider.generate_questions(f"Transcript chunk {i}.", 1)
+            timings.append(time.perf_counter() - start)
+            if not questions:
+                raise RuntimeError("provider returned no questions")
+
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    cuts = statistics.quantiles(timings, n=100)
+    print(
+        f"{label:>8} {statistics.median(timings) * 1000:>9.0f} {cuts[94] * 1000:>9.0f} "
+        f"{cuts[98] * 1000:>9.0f} {max(timings) * 1000:>9.0f}"
+    )
+
+
+async def main(n: int, concurrency: int, stall_rate: float, stall_seconds: float) -> None:
+    openai_server = _serve(
+        {"choices": [{"message": {"content": REPLY}}]}, stall_rate, stall_seconds
+    )
+    anthropic_server = _serve(
+        {"content": [{"type": "text", "text": REPLY}]}, stall_rate, stall_seconds
+    )
+
+    def providers():
+        return (
+            OpenAIProvider(
+                api_key="mock",
+                base_url=f"http://127.0.0.1:{openai_server.server_port}",
+                max_retries=0,
+            ),
+            AnthropicProvider(
+                api_key="mock",
+                base_url=f"http://127.0.0.1:{anthropic_server.server_port}",
+                max_retries=0,
+            ),
+        )
+
+    print(f"{'':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    single, _ = providers()
+    _report("single", await _measure(single, n, concurrency))
+
+    hedged = HedgedProvider(list(providers()), initial_delay=0.3, min_samples=20)
+    # Warm up the latency window so the hedge delay is the learned percentile.
+    await _measure(hedged, 50, concurrency)
+    _report("hedged", await _measure(hedged, n, concurrency))
+    print(f"hedge delay {hedged.hedge_delay(0, 'single') * 1000:.0f} ms, {hedged.stats()}")
+
+    await close_http_client()
+    openai_server.shutdown()
+    anthropic_server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.stall_rate, args.stall_seconds))
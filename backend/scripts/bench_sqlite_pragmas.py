@@ -0,0 +1,136 @@
+"""Compare answer and session throughput with and without the SQLite connection profile.
+
+Runs the same mixed workload (graded answers and session builds from
+concurrent clients) against a fresh database with SQLite's defaults and with
+the pragmas from Settings, and reports throughput and lock errors.
+
+Usage (from backend/):
+    python -m scripts.bench_sqlite_pragmas [--questions 5000] [--clients 8] [--seconds 5]
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from app.ai.base import GeneratedChoice, GeneratedQuestion
+from app.config import settings
+from app.database import apply_sqlite_pragmas, init_db, sqlite_pragmas
+from app.models.progress import UserProgress
+from app.models.video import Video
+from app.services.question_store import bulk_insert_questions
+from app.services.session_builder import build_session
+from app.services.spaced_repetition import ReviewState, initial_review_state, next_review_state
+
+
+def _fake_questions(n: int) -> list[GeneratedQuestion]:
+    return [
+        GeneratedQuestion(
+            question_text=f"Benchmark question {i}?",
+            choices=[
+                GeneratedChoice(id=f"c{j}", text=f"Choice {j}", is_correct=j == 0)
+                for j in range(4)
+            ],
+            correct_choice_id="c0",
+            explanation="Because.",
+            difficulty="medium",
+        )
+        for i in range(n)
+    ]
+
+
+async def _answer(db: AsyncSession, question_id: str) -> None:
+    # The same read-then-update transaction as POST /api/quiz/answer.
+    now = datetime.now(timezone.utc)
+    row = (
+        await db.execute(
+            select(UserProgress.id, *(getattr(UserProgress, f) for f in ReviewState._fields))
+            .where(
+                UserProgress.user_id == settings.default_user_id,
+                UserProgress.question_id == question_id,
+            )
+        )
+    ).one()
+    state = next_review_state(ReviewState(*row[1:]), random.random() < 0.8, now)
+    await db.execute(
+        update(UserProgress)
+        .where(UserProgress.id == row.id)
+        .values(**state._asdict(), updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def _client(session_factory, question_ids: list[str], deadline: float, counts: dict) -> None:
+    while time.perf_counter() < deadline:
+        kind = "sessions" if random.random() < 0.2 else "answers"
+        try:
+            async with session_factory() as db:
+                if kind == "sessions":
+                    await build_session(db, settings.default_user_id)
+                else:
+                    await _answer(db, random.choice(question_ids))
+            counts[kind] += 1
+        except OperationalError:
+            counts["lock_errors"] += 1
+
+
+async def _run(profile: str, n: int, clients: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        if profile == "tuned":
+            apply_sqlite_pragmas(engine, sqlite_pragmas())
+        await init_db(engine)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with session_factory() as db:
+            video = Video(youtube_id="benchmark00", url="", title="Benchmark", thumbnail_url="")
+            db.add(video)
+            await db.flush()
+            question_ids = await bulk_insert_questions(db, video.id, _fake_questions(n))
+            # Answers update an existing row, so the learner has seen every question.
+            initial = initial_review_state(datetime.now(timezone.utc))._asdict()
+            await db.execute(
+                insert(UserProgress),
+                [
+                    {"user_id": settings.default_user_id, "question_id": qid, **initial}
+                    for qid in question_ids
+                ],
+            )
+            await db.commit()
+
+        counts = {"answers": 0, "sessions": 0, "lock_errors": 0}
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(_client(session_factory, question_ids, deadline, counts) for _ in range(clients))
+        )
+        await engine.dispose()
+        return counts
+
+
+async def main(n: int, clients: int, seconds: float) -> None:
+    # Measure the database, not the in-memory index.
+    settings.due_index_enabled = False
+
+    print(f"{'profile':>8} {'answers/s':>10} {'sessions/s':>11} {'lock errors':>12}")
+    for profile in ("default", "tuned"):
+        counts = await _run(profile, n, clients, seconds)
+        print(
+            f"{profile:>8} {counts['answers'] / seconds:>10.0f} "
+            f"{counts['sessions'] / seconds:>11.0f} {counts['lock_errors']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.questions, args.clients, args.seconds))
@@ -0,0 +1,112 @@
+"""Record EXPLAIN QUERY PLAN for the scheduling hot queries and fail on full scans.
+
+Migrates a scratch SQLite database to head, runs the hot code paths against
+it while capturing every SELECT they issue, then explains each statement.
+Only index SEARCH steps pass silently: a step that SCANs a table, with or
+without an index (an index scan still walks the whole index), exits
+non-zero unless it is listed in ACCEPTED_SCANS with the reason it is fine.
+
+Usage (from backend/):
+    python -m scripts.check_query_plans [--output plans.txt]
+"""
+
+import re
+import sys
+import asyncio
+import argparse
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+import app.models  # noqa: F401  (registers tables on Base.metadata)
+from app.config import settings
+from app.database import Base, init_db
+from app.services.session_builder import build_session
+
+# Older SQLite versions print "SCAN TABLE x"; index walks add "USING [COVERING] INDEX i".
+SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?")
+
+# (hot path, table, index or None) -> why the scan is acceptable.
+ACCEPTED_SCANS = {
+    ("build_session", "questions", "ix_questions_video_segment"): (
+        "new questions are the ones with no progress row for the learner, an anti-join"
+        " no index can answer by search; in production the due index serves this bucket"
+    ),
+}
+
+
+async def _capture(engine, hot_paths) -> list[tuple[str, str, tuple]]:
+    captured: list[tuple[str, str, tuple]] = []
+    current = ""
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((current, statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for name, path in hot_paths:
+        current = name
+        async with session_factory() as db:
+            await path(db)
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+async def main(output: str | None) -> int:
+    # Plan the SQL path, not the in-memory due index.
+    settings.due_index_enabled = False
+
+    hot_paths = [
+        ("build_session", lambda db: build_session(db, settings.default_user_id)),
+    ]
+
+    tables = set(Base.metadata.tables)
+    failures = 0
+    lines: list[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/plans.db")
+        await init_db(engine)
+        captured = await _capture(engine, hot_paths)
+
+        async with engine.connect() as conn:
+            for name, statement, params in captured:
+                rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)
+                plan = [row[3] for row in rows]
+                lines.append(f"-- {name}\n{statement.strip()}")
+                for step in plan:
+                    match = SCAN.search(step)
+                    # ORM aliases render as e.g. user_progress_1.
+                    table = match and re.sub(r"_\d+$", "", match.group(1))
+                    note = ""
+                    if match and table in tables:
+                        accepted = ACCEPTED_SCANS.get((name, table, match.group(2)))
+                        if accepted:
+                            note = f"ACCEPTED SCAN ({accepted}) "
+                        else:
+                            note = "SCAN "
+                            failures += 1
+                    lines.append(f"  {note}{step}")
+                lines.append("")
+
+        await engine.dispose()
+
+    report = "\n".join(lines)
+    print(report)
+    if output:
+        with open(output, "w") as f:
+            f.write(report)
+
+    if failures:
+        print(f"{failures} unaccepted table or index scan(s) in hot queries", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="also write the recorded plans to this file")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.output)))
@@ -0,0 +1,75 @@
+"""Compute MinHash signatures for questions that don't have one yet.
+
+Run once after upgrading so questions generated before near-duplicate
+detection are checked against by later ingests. Existing questions are
+indexed as they are; none are removed. `--rebuild` first drops every stored
+signature, for when what a signature covers has changed (signatures used to
+cover the question text alone, now the text and its correct answer).
+
+Usage (from backend/):
+    python -m scripts.index_question_signatures [--rebuild]
+"""
+
+import asyncio
+import argparse
+
+from sqlalchemy import delete, select
+
+from app.database import async_session, engine
+from app.models.question import Question
+from app.models.question_signature import QuestionLshBucket, QuestionSignature
+from app.services.near_duplicates import matching_text, save_signatures, signature
+
+BATCH_SIZE = 1000
+
+
+def _answer(choices: list[dict], correct_choice_id: str) -> str:
+    return next((c["text"] for c in choices if c["id"] == correct_choice_id), "")
+
+
+async def main(rebuild: bool) -> None:
+    indexed = 0
+    async with async_session() as db:
+        if rebuild:
+            await db.execute(delete(QuestionLshBucket))
+            await db.execute(delete(QuestionSignature))
+            await db.commit()
+        while True:
+            rows = (
+                await db.execute(
+                    select(
+                        Question.id,
+                        Question.question_text,
+                        Question.choices,
+                        Question.correct_choice_id,
+                    )
+                    .outerjoin(QuestionSignature)
+                    .where(QuestionSignature.question_id.is_(None))
+                    .limit(BATCH_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+            await save_signatures(
+                db,
+                [row.id for row in rows],
+                [
+                    signature(
+                        matching_text(
+                            row.question_text, _answer(row.choices, row.correct_choice_id)
+                        )
+                    )
+                    for row in rows
+                ],
+            )
+            await db.commit()
+            indexed += len(rows)
+    await engine.dispose()
+    print(f"Indexed {indexed} question(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.rebuild))
@@ -0,0 +1,128 @@
+"""Measure per-learner session latency as the number of learners grows.
+
+Seeds one library of questions, then adds learners with progress on a
+random share of it in steps (100, 1,000 and 10,000 by default). After each
+step it times `build_session` for a sample of learners. With the per-user
+indexes the latency should stay flat as the total grows.
+
+Usage (from backend/):
+    python -m scripts.load_test_users [--users 100 1000 10000] [--questions 2000]
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from app.ai.base import GeneratedChoice, GeneratedQuestion
+from app.config import settings
+from app.database import apply_sqlite_pragmas, init_db, sqlite_pragmas
+from app.models.progress import UserProgress
+from app.models.video import Video
+from app.services.question_store import bulk_insert_questions
+from app.services.session_builder import build_session
+
+
+def _fake_questions(n: int) -> list[GeneratedQuestion]:
+    return [
+        GeneratedQuestion(
+            question_text=f"Load test question {i}?",
+            choices=[
+                GeneratedChoice(id=f"c{j}", text=f"Choice {j}", is_correct=j == 0)
+                for j in range(4)
+            ],
+            correct_choice_id="c0",
+            explanation="Because.",
+            difficulty="medium",
+        )
+        for i in range(n)
+    ]
+
+
+async def _seed_users(
+    db: AsyncSession, user_ids: list[str], question_ids: list[str], reviewed: int
+) -> None:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for user_id in user_ids:
+        for question_id in random.sample(question_ids, reviewed):
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "repetitions": random.randint(1, 6),
+                    "ease_factor": random.uniform(1.3, 2.8),
+                    "interval_days": random.uniform(1, 30),
+                    "next_review_at": now + timedelta(days=random.uniform(-10, 20)),
+                    "last_reviewed_at": now - timedelta(days=random.uniform(0, 30)),
+                }
+            )
+        if len(rows) >= 50_000:
+            await db.execute(insert(UserProgress), rows)
+            rows = []
+    if rows:
+        await db.execute(insert(UserProgress), rows)
+    await db.commit()
+
+
+async def _time_sessions(session_factory, user_ids: list[str]) -> list[float]:
+    timings = []
+    for user_id in user_ids:
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await build_session(db, user_id)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main(steps: list[int], n_questions: int, reviewed: int, sample: int) -> None:
+    # Measure the database, not the in-memory index.
+    settings.due_index_enabled = False
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/load.db")
+        apply_sqlite_pragmas(engine, sqlite_pragmas())
+        await init_db(engine)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with session_factory() as db:
+            video = Video(youtube_id="loadtest000", url="", title="Load test", thumbnail_url="")
+            db.add(video)
+            await db.flush()
+            question_ids = await bulk_insert_questions(db, video.id, _fake_questions(n_questions))
+            await db.commit()
+
+        print(f"{'users':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+        user_ids: list[str] = []
+        for total in sorted(steps):
+            added = [f"user-{i}" for i in range(len(user_ids), total)]
+            async with session_factory() as db:
+                await _seed_users(db, added, question_ids, min(reviewed, n_questions))
+            user_ids.extend(added)
+
+            timings = await _time_sessions(
+                session_factory, random.sample(user_ids, min(sample, len(user_ids)))
+            )
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            print(
+                f"{total:>8} {statistics.median(timings):>9.2f} {p95:>9.2f} {max(timings):>9.2f}"
+            )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--reviewed", type=int, default=200, help="questions each user has seen")
+    parser.add_argument("--sample", type=int, default=200, help="sessions timed per step")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.questions, args.reviewed, args.sample))
@@ -0,0 +1,22 @@
+"""Recompute video question counts and per-learner mastered counts from the source rows.
+
+Usage (from backend/):
+    python -m scripts.repair_mastery
+"""
+
+import asyncio
+
+from app.database import async_session, engine
+from app.services.mastery import repair_mastery_counters
+
+
+async def main() -> None:
+    async with async_session() as db:
+        fixed = await repair_mastery_counters(db)
+        await db.commit()
+    await engine.dispose()
+    print(f"Repaired {fixed} counter(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
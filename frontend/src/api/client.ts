@@ -1,9 +1,12 @@
 import axios from 'axios';
 import type {
-  Video,
+  VideoPage,
   VideoDetail,
+  IngestJob,
   QuizSession,
   AnswerResult,
+  AnswerSubmit,
+  AnswerBatchItem,
   SessionSummary,
   ProgressOverview,
   StreakData,
@@ -15,9 +18,10 @@ const api = axios.create({
 });
 
 export const videosApi = {
-  add: (url: string) =>
-    api.post<Video>('/videos', { url }, { timeout: 5 * 60 * 1000 }).then((r) => r.data),
-  list: () => api.get<Video[]>('/videos').then((r) => r.data),
+  add: (url: string) => api.post<IngestJob>('/videos', { url }).then((r) => r.data),
+  getJob: (id: string) => api.get<IngestJob>(`/videos/jobs/${id}`).then((r) => r.data),
+  list: (cursor?: string) =>
+    api.get<VideoPage>('/videos', { params: { cursor } }).then((r) => r.data),
   get: (id: string) => api.get<VideoDetail>(`/videos/${id}`).then((r) => r.data),
   delete: (id: string) => api.delete(`/videos/${id}`).then((r) => r.data),
 };
@@ -31,6 +35,8 @@ export const quizApi = {
         chosen_choice_id: chosenChoiceId,
       })
       .then((r) => r.data),
+  submitAnswers: (answers: AnswerSubmit[]) =>
+    api.post<AnswerBatchItem[]>('/quiz/answers', answers).then((r) => r.data),
   completeSession: (answered: number, correct: number) =>
     api
       .post<SessionSummary>('/quiz/session/complete', {
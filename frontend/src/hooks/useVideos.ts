@@ -1,11 +1,28 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { videosApi } from '../api/client';
+import type { IngestJob } from '../types';
+
+const JOB_POLL_INTERVAL_MS = 2000;
+
+async function waitForJob(job: IngestJob): Promise<IngestJob> {
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await videosApi.getJob(job.id);
+  }
+  if (job.status === 'failed') {
+    throw new Error(job.error ?? 'Failed to add video');
+  }
+  return job;
+}
 
 export function useVideos() {
-  return useQuery({
+  const query = useInfiniteQuery({
     queryKey: ['videos'],
-    queryFn: videosApi.list,
+    queryFn: ({ pageParam }) => videosApi.list(pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   });
+  return { ...query, data: query.data?.pages.flatMap((page) => page.items) };
 }
 
 export function useVideo(id: string) {
@@ -19,7 +36,7 @@ export function useVideo(id: string) {
 export function useAddVideo() {
   const queryClient = useQueryClient();
   return useMutation({
-    mutationFn: (url: string) => videosApi.add(url),
+    mutationFn: (url: string) => videosApi.add(url).then(waitForJob),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['videos'] });
     },
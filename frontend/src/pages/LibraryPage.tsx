@@ -5,7 +5,7 @@ import { useVideos, useDeleteVideo } from '../hooks/useVideos';
 
 export function LibraryPage() {
   const navigate = useNavigate();
-  const { data: videos, isLoading } = useVideos();
+  const { data: videos, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useVideos();
   const deleteVideo = useDeleteVideo();
 
   const handleDelete = (id: string) => {
@@ -43,7 +43,18 @@ export function LibraryPage() {
             </svg>
           </div>
         ) : (
-          <VideoList videos={videos ?? []} onDelete={handleDelete} />
+          <>
+            <VideoList videos={videos ?? []} onDelete={handleDelete} />
+            {hasNextPage && (
+              <button
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+                className="my-4 w-full rounded-lg border border-brand-gray-200 py-2 text-sm font-bold text-brand-gray-800 active:scale-[0.98] disabled:opacity-50"
+              >
+                {isFetchingNextPage ? 'Loading…' : 'Load more'}
+              </button>
+            )}
+          </>
         )}
       </div>
     </div>
@@ -24,9 +24,31 @@ export interface Video {
   mastery_percentage: number;
 }
 
+export interface VideoPage {
+  items: Video[];
+  next_cursor: string | null;
+}
+
+export type IngestJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface IngestJob {
+  id: string;
+  youtube_id: string;
+  url: string;
+  status: IngestJobStatus;
+  video_id: string | null;
+  chunks_total: number;
+  chunks_done: number;
+  question_count: number;
+  error: string | null;
+  created_at: string;
+  updated_at: string;
+}
+
 export interface VideoDetail extends Video {
-  transcript_text: string;
+  transcript_text: string | null;
   questions: Question[];
+  questions_next_cursor: string | null;
 }
 
 export interface QuizSession {
@@ -45,6 +67,18 @@ export interface AnswerResult {
   next_review_at: string;
 }
 
+export interface AnswerSubmit {
+  question_id: string;
+  chosen_choice_id: string;
+  answered_at?: string;
+}
+
+export interface AnswerBatchItem {
+  question_id: string;
+  result: AnswerResult | null;
+  error: string | null;
+}
+
 export interface SessionSummary {
   questions_answered: number;
   questions_correct: number;